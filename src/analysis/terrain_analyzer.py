@@ -19,6 +19,7 @@ import numpy as np
 from scipy import ndimage
 from typing import Dict, Tuple, Optional
 from ..progress_tracker import ProgressTracker
+from ..buildability_enforcer import median_and_percentiles
 
 
 class TerrainAnalyzer:
@@ -77,21 +78,35 @@ class TerrainAnalyzer:
         # Calculate gradients using Sobel filter
         # Sobel returns gradient in pixel units, scale by height_scale and divide by pixel spacing
         # This gives us meters of height per meter of distance (slope ratio)
-        gradient_y = ndimage.sobel(self.heightmap, axis=0) * self.height_scale / self.pixel_size_meters
-        gradient_x = ndimage.sobel(self.heightmap, axis=1) * self.height_scale / self.pixel_size_meters
+        # (all steps below run in place in the two Sobel output arrays -
+        # same operations, no full-size temporaries; integer heightmaps get
+        # float64 gradients, as the scaling used to promote them)
+        gradients = []
+        for axis in (0, 1):
+            gradient = ndimage.sobel(self.heightmap, axis=axis)
+            if not np.issubdtype(gradient.dtype, np.floating):
+                gradient = gradient.astype(np.float64)
+            gradient *= self.height_scale
+            gradient /= self.pixel_size_meters
+            gradients.append(gradient)
+        gradient_y, gradient_x = gradients
 
         # Calculate slope magnitude
         # slope = arctan(sqrt(dz/dx^2 + dz/dy^2))
         # gradient_magnitude is now in meters per meter (slope ratio)
-        gradient_magnitude = np.sqrt(gradient_x**2 + gradient_y**2)
-        slope_radians = np.arctan(gradient_magnitude)
+        gradient_magnitude = np.multiply(gradient_x, gradient_x, out=gradient_x)
+        gradient_magnitude += np.multiply(gradient_y, gradient_y, out=gradient_y)
+        np.sqrt(gradient_magnitude, out=gradient_magnitude)
+        slope_radians = np.arctan(gradient_magnitude, out=gradient_magnitude)
 
         # Convert to requested units
         if units == 'degrees':
-            return np.degrees(slope_radians)
+            return np.degrees(slope_radians, out=slope_radians)
         elif units == 'percent':
             # Percent slope = (rise/run) * 100
-            return np.tan(slope_radians) * 100.0
+            slope_percent = np.tan(slope_radians, out=slope_radians)
+            slope_percent *= 100.0
+            return slope_percent
         else:  # radians
             return slope_radians
 
@@ -190,15 +205,19 @@ class TerrainAnalyzer:
         stats['min_height'] = float(np.min(self.heightmap))
         stats['max_height'] = float(np.max(self.heightmap))
         stats['mean_height'] = float(np.mean(self.heightmap))
-        stats['median_height'] = float(np.median(self.heightmap))
-        stats['std_height'] = float(np.std(self.heightmap))
+        # Median and quartiles from one partitioned copy (not four)
+        median, quartiles = median_and_percentiles(self.heightmap, (25, 50, 75))
+        stats['median_height'] = float(median)
+        # np.std is sqrt(np.var); take the root of one variance pass
+        variance = np.var(self.heightmap)
+        stats['std_height'] = float(np.sqrt(variance))
         stats['range_height'] = stats['max_height'] - stats['min_height']
-        stats['variance'] = float(np.var(self.heightmap))
+        stats['variance'] = float(variance)
 
         # Percentiles
-        stats['percentile_25'] = float(np.percentile(self.heightmap, 25))
-        stats['percentile_50'] = float(np.percentile(self.heightmap, 50))
-        stats['percentile_75'] = float(np.percentile(self.heightmap, 75))
+        stats['percentile_25'] = float(quartiles[0])
+        stats['percentile_50'] = float(quartiles[1])
+        stats['percentile_75'] = float(quartiles[2])
 
         # Slope statistics
         slopes = self.calculate_slope(units='degrees')
@@ -210,8 +229,8 @@ class TerrainAnalyzer:
         steep_mask = slopes > 45.0  # Greater than 45 degrees
 
         total_cells = self.height * self.width
-        stats['flat_percent'] = float(np.sum(flat_mask) / total_cells * 100)
-        stats['steep_percent'] = float(np.sum(steep_mask) / total_cells * 100)
+        stats['flat_percent'] = float(np.count_nonzero(flat_mask) / total_cells * 100)
+        stats['steep_percent'] = float(np.count_nonzero(steep_mask) / total_cells * 100)
 
         return stats
 
@@ -24,8 +24,383 @@ Modified: 2025-10-08 (Added Task 2.2 implementation)
 
 import numpy as np
 from scipy.ndimage import gaussian_filter
+from scipy.signal import fftconvolve
 from typing import Optional, Tuple, Dict
 
+# Try to import numba for fused per-pixel slope kernels
+# NOTE: All kernels use cache=True, so they compile once per environment
+# (~5s cold); later processes load them from __pycache__. What remains on the
+# first call (~0.3s) is numba's parallel runtime start-up, which any cached
+# prange kernel pays, so eager signatures / an import-time warm-up / pycc AOT
+# would only move that cost to import time (for every importer).
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Graceful fallback if numba not available (NumPy paths are used instead)
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+@njit(inline='always', cache=True)
+def _cell_slope(heightmap, i, j, height_scale, pixel_size, half, hundred):
+    """
+    Slope percentage of one cell (np.gradient + magnitude fused).
+
+    Same operations, in the same order and precision, as calculate_slopes():
+    interior cells use central differences / 2, edge cells one-sided
+    differences, and the height scale is applied after the root (see
+    calculate_slopes). The scalar arguments carry the heightmap's dtype so
+    float32 maps stay float32.
+
+    WHY `* half` rather than `/ 2`: halving is exact either way, so the
+    result is identical, but a division by a runtime value keeps LLVM from
+    vectorizing the loop (~1.6x slower kernels for float64 maps).
+    """
+    rows, cols = heightmap.shape
+    up = max(i - 1, 0)
+    down = min(i + 1, rows - 1)
+    left = max(j - 1, 0)
+    right = min(j + 1, cols - 1)
+
+    dy = heightmap[down, j] - heightmap[up, j]
+    if 0 < i < rows - 1:
+        dy = dy * half
+    dx = heightmap[i, right] - heightmap[i, left]
+    if 0 < j < cols - 1:
+        dx = dx * half
+
+    return np.sqrt(dx * dx + dy * dy) * height_scale / pixel_size * hundred
+
+
+@njit(parallel=True, cache=True)
+def _slopes_numba(heightmap, height_scale, pixel_size, half, hundred, out):
+    """Slope percentage per cell in one pass (see _cell_slope)."""
+    rows, cols = heightmap.shape
+    for i in prange(rows):
+        for j in range(cols):
+            out[i, j] = _cell_slope(heightmap, i, j, height_scale, pixel_size, half, hundred)
+
+
+@njit(parallel=True, cache=True)
+def _buildable_counts_numba(heightmap, height_scale, pixel_size, half, hundred, partial):
+    """
+    Per-row count of cells with slope <= 5%, computed straight from heights.
+
+    The slope of each cell is computed exactly as in _slopes_numba but
+    only compared, never stored, so no slope map is written or re-read.
+    """
+    rows, cols = heightmap.shape
+    for i in prange(rows):
+        count = 0
+        for j in range(cols):
+            count += _cell_slope(heightmap, i, j, height_scale, pixel_size, half, hundred) <= 5.0
+        partial[i] = count
+
+
+@njit(parallel=True, cache=True)
+def _problem_cells_numba(heightmap, buildable_mask, height_scale, pixel_size, half, hundred,
+                         problem_mask, partial):
+    """
+    Problem-cell mask (buildable zone AND slope > 5%) straight from heights.
+
+    Also counts, per row, buildable-slope cells (partial[i, 0]) and problem
+    cells (partial[i, 1]). Slopes are computed as in _slopes_numba but never
+    stored.
+    """
+    rows, cols = heightmap.shape
+    for i in prange(rows):
+        buildable = 0
+        problems = 0
+        for j in range(cols):
+            slope = _cell_slope(heightmap, i, j, height_scale, pixel_size, half, hundred)
+            buildable += slope <= 5.0
+            problem = buildable_mask[i, j] > 0.5 and slope > 5.0
+            problem_mask[i, j] = problem
+            problems += problem
+        partial[i, 0] = buildable
+        partial[i, 1] = problems
+
+
+@njit(parallel=True, cache=True)
+def _smart_blend_numba(heightmap, blurred, local_mean_sq, local_mean, problem_mask,
+                       threshold, one, out):
+    """
+    Smart Blur's feature test and blend, one read/write per cell.
+
+    Same operations, in the same order and precision, as the NumPy path of
+    smart_blur(): variance = E[h^2] - E[h]^2, cells above the threshold are
+    features and keep their height, elsewhere the blur is blended in with
+    weight problem_mask. Scalars carry the heightmap's dtype.
+    """
+    rows, cols = heightmap.shape
+    zero = one - one
+    for i in prange(rows):
+        for j in range(cols):
+            variance = local_mean_sq[i, j] - local_mean[i, j] * local_mean[i, j]
+            # Feature cells get weight problem_mask * 0 (as the NumPy mask product)
+            weight = problem_mask[i, j] * (zero if variance > threshold else one)
+            out[i, j] = heightmap[i, j] * (one - weight) + blurred[i, j] * weight
+
+
+@njit(parallel=True, cache=True)
+def _slope_category_counts_numba(slopes, partial):
+    """
+    Per-row counts of the analyze_buildability() slope categories.
+
+    One pass counts cells <= 5%, <= 10% and > 10% (NaN counts in none, as
+    with the comparison masks); 5-10% is the difference of the first two.
+    Rows write their own partial counts so the result does not depend on
+    thread scheduling.
+    """
+    rows, cols = slopes.shape
+    for i in prange(rows):
+        excellent = 0
+        acceptable = 0
+        steep = 0
+        for j in range(cols):
+            s = slopes[i, j]
+            # Branch-free accumulation (slopes are noisy, branches mispredict).
+            # NOTE: LLVM vectorizes this into packed compares + mask adds
+            # (~1.2 G cells/s on one core), i.e. what a hand-written AVX2
+            # compare/movemask/popcount C extension would do
+            excellent += s <= 5.0
+            acceptable += s <= 10.0
+            steep += s > 10.0
+        partial[i, 0] = excellent
+        partial[i, 1] = acceptable - excellent
+        partial[i, 2] = steep
+
+
+def _slope_category_counts(slopes: np.ndarray) -> Tuple[int, int, int]:
+    """
+    Count cells with slope <= 5%, in (5%, 10%] and > 10%.
+
+    Uses a single fused pass when numba is available instead of one
+    boolean temporary + reduction per category.
+    """
+    if NUMBA_AVAILABLE and slopes.ndim == 2:
+        partial = np.empty((slopes.shape[0], 3), dtype=np.int64)
+        _slope_category_counts_numba(slopes, partial)
+        excellent, acceptable, steep = partial.sum(axis=0)
+        return int(excellent), int(acceptable), int(steep)
+
+    excellent = np.count_nonzero(slopes <= 5.0)
+    steep = np.count_nonzero(slopes > 10.0)
+    acceptable = np.count_nonzero(slopes <= 10.0) - excellent
+    return excellent, acceptable, steep
+
+
+# Optional: OpenCV separable Gaussian (SIMD) for the Smart Blur passes
+# Graceful fallback to scipy if unavailable
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Without OpenCV, blurs from this sigma up are faster as two 1-D FFT
+# convolutions (cost independent of sigma) than with gaussian_filter
+_FFT_BLUR_MIN_SIGMA = 8.0
+
+
+def _gaussian_blur(data: np.ndarray, sigma: float) -> np.ndarray:
+    """
+    Gaussian blur with scipy's 'reflect' boundary and 4-sigma kernel radius.
+
+    WHY: gaussian_filter's cost grows with sigma. cv2.sepFilter2D runs the
+    same two 1-D passes with SIMD kernels (~2-8x faster at 4096x4096), and
+    without OpenCV large sigmas go through separable FFT convolution of the
+    reflect-padded map. Both use scipy's kernel, so results only differ from
+    gaussian_filter(mode='reflect') by float rounding.
+    """
+    radius = int(4.0 * sigma + 0.5)
+    if data.dtype not in (np.float32, np.float64) or radius >= min(data.shape):
+        return gaussian_filter(data, sigma=sigma, mode='reflect')
+    if not CV2_AVAILABLE and sigma < _FFT_BLUR_MIN_SIGMA:
+        return gaussian_filter(data, sigma=sigma, mode='reflect')
+
+    x = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (x / sigma) ** 2)
+    kernel = (kernel / kernel.sum()).astype(data.dtype)
+
+    if CV2_AVAILABLE:
+        return cv2.sepFilter2D(data, -1, kernel, kernel, borderType=cv2.BORDER_REFLECT)
+
+    # scipy 'reflect' == numpy 'symmetric' padding
+    padded = np.pad(data, radius, mode='symmetric')
+    padded = fftconvolve(padded, kernel[:, None], mode='same')
+    padded = fftconvolve(padded, kernel[None, :], mode='same')
+    return np.ascontiguousarray(padded[radius:-radius, radius:-radius], dtype=data.dtype)
+
+
+def _percentile_pairs(values: np.ndarray, percents):
+    """
+    Neighbouring order statistics behind np.percentile for ascending percents.
+
+    WHY: every np.percentile / np.median call copies the map and partitions
+    it around two order statistics. Here one copy is partitioned around the
+    upper order statistic of each percentile in turn, each step only within
+    the part above the previous one, and the lower neighbour is the max of
+    the part just below. All percentiles cost about as much as one call.
+
+    Args:
+        values: Array of any shape (not modified)
+        percents: Ascending percentiles in [0, 100]
+
+    Returns:
+        List of (lower_value, upper_value, t) per percentile, where t is the
+        interpolation weight numpy's 'linear' method applies between them
+    """
+    work = values.ravel().copy()
+    n = work.size
+    pairs = []
+    start = 0
+    last_kth = None
+    for percent in percents:
+        index = percent / 100.0 * (n - 1)
+        lower = int(np.floor(index))
+        t = index - lower
+        if t == 0.0 or lower + 1 >= n:
+            kth, t = lower, 0.0
+        else:
+            kth = lower + 1
+
+        if kth != last_kth:
+            work[start:].partition(kth - start)
+            upper_value = work[kth]
+            # Everything before `start` is <= work[start - 1] (previous kth)
+            lower_value = work[start:kth].max() if kth > start else work[kth - 1]
+            start, last_kth = kth + 1, kth
+        pairs.append((lower_value, upper_value, t))
+    return pairs
+
+
+def median_and_percentiles(values: np.ndarray, percents) -> Tuple[object, list]:
+    """
+    np.median(values) and np.percentile(values, p) for each p in one go.
+
+    Values (and dtypes) are identical to the separate numpy calls, but all
+    order statistics come from a single partitioned copy (see
+    _percentile_pairs) instead of one copy + partition per call.
+
+    Args:
+        values: Array of any shape (not modified)
+        percents: Percentiles in [0, 100], in any order
+
+    Returns:
+        (median, [percentile for each of percents])
+    """
+    # WHY NaN (and empty) inputs go to numpy: a partition sorts NaN last, so
+    # the order statistics below would skip it where numpy returns nan.
+    # max() propagates NaN without allocating a mask.
+    if (not np.issubdtype(values.dtype, np.floating)
+            or values.size == 0 or np.isnan(values.max())):
+        return np.median(values), [np.percentile(values, p) for p in percents]
+
+    order = sorted(set(percents) | {50.0})
+    pairs = dict(zip(order, _percentile_pairs(values, order)))
+
+    def lerp(lower_value, upper_value, t):
+        # numpy's 'linear' interpolation (_lerp), evaluated the same way
+        if t == 0.0:
+            return upper_value
+        diff = upper_value - lower_value
+        if t >= 0.5:
+            return upper_value - diff * (1 - t)
+        return lower_value + diff * t
+
+    # np.median averages the two middle values instead of interpolating
+    lower_value, upper_value, t = pairs[50.0]
+    median = upper_value if t == 0.0 else np.mean(
+        np.array([lower_value, upper_value], dtype=values.dtype))
+
+    return median, [lerp(*pairs[p]) for p in percents]
+
+
+def _fused_slope_args(heightmap: np.ndarray, pixel_size_meters: float):
+    """
+    Scalar arguments for the fused slope kernels, or None if they can't run.
+
+    The scalars carry the heightmap's dtype so float32 maps stay float32.
+    """
+    if not (NUMBA_AVAILABLE and heightmap.ndim == 2 and min(heightmap.shape) >= 2
+            and heightmap.dtype in (np.float32, np.float64)):
+        return None
+    as_dtype = heightmap.dtype.type
+    return as_dtype(4096.0), as_dtype(pixel_size_meters), as_dtype(0.5), as_dtype(100.0)
+
+
+def _problem_cells(heightmap: np.ndarray, buildable_mask: np.ndarray,
+                   map_size_meters: float,
+                   out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, int]:
+    """
+    Cells enforce_buildability_constraint() still has to smooth.
+
+    Args:
+        out: Optional bool array (heightmap's shape) to write the mask into
+
+    Returns:
+        (problem_mask, buildable_pct, problem_count): problem_mask marks
+        buildable-zone cells (buildable_mask > 0.5) with slopes > 5%,
+        buildable_pct is the heightmap's buildability percentage
+    """
+    if out is None:
+        out = np.empty(heightmap.shape, dtype=bool)
+
+    pixel_size_meters = map_size_meters / heightmap.shape[0]
+    kernel_args = _fused_slope_args(heightmap, pixel_size_meters)
+    if kernel_args is None or buildable_mask.shape != heightmap.shape:
+        slopes = BuildabilityEnforcer.calculate_slopes(heightmap, map_size_meters)
+        np.greater(buildable_mask, 0.5, out=out)
+        out &= slopes > 5.0
+        return (out,
+                BuildabilityEnforcer.calculate_buildability_percentage(slopes),
+                int(np.count_nonzero(out)))
+
+    # Fused path: no slope map, just the mask and two counts per row
+    partial = np.empty((heightmap.shape[0], 2), dtype=np.int64)
+    _problem_cells_numba(heightmap, buildable_mask, *kernel_args, out, partial)
+    buildable_count, problem_count = partial.sum(axis=0)
+    return out, (buildable_count / heightmap.size) * 100.0, int(problem_count)
+
+# Block size (bytes per block of rows) for the NumPy slope fallback
+_SLOPE_TILE_BYTES = 1 << 20
+
+
+def _slopes_numpy(heightmap: np.ndarray, pixel_size_meters: float) -> np.ndarray:
+    """NumPy slope formula of calculate_slopes() for a heightmap or block of rows."""
+    # Convert to meters (CS2 height range: 0-4096m)
+    # WHY after the root for float32/float64: 4096 is a power of two, so
+    # scaling the gradient magnitude gives exactly the same values as
+    # scaling every height first - minus one full-array pass. Narrower
+    # types (float16 squares underflow) and integers scale up front.
+    scale_after = heightmap.dtype in (np.float32, np.float64)
+    heightmap_meters = heightmap if scale_after else heightmap * 4096.0
+
+    # Calculate gradients
+    dy, dx = np.gradient(heightmap_meters)
+
+    # Slope ratio = sqrt(dx² + dy²) / pixel_size
+    # (in place in the gradient buffers - no temporaries for the squares,
+    # sum, root and scaling)
+    slope_ratio = np.multiply(dx, dx, out=dx)
+    slope_ratio += np.multiply(dy, dy, out=dy)
+    np.sqrt(slope_ratio, out=slope_ratio)
+    if scale_after:
+        slope_ratio *= 4096.0
+    slope_ratio /= pixel_size_meters
+
+    # Convert to percentage
+    slope_ratio *= 100.0
+    return slope_ratio
+
 
 class BuildabilityEnforcer:
     """
@@ -115,7 +490,7 @@ class BuildabilityEnforcer:
             mask = (distance_field > distance_threshold) | (tectonic_elevation < elev_threshold)
 
             # Calculate buildable percentage
-            buildable_count = np.sum(mask)
+            buildable_count = np.count_nonzero(mask)
             buildable_pct = (buildable_count / total_pixels) * 100.0
 
             if verbose:
@@ -158,7 +533,7 @@ class BuildabilityEnforcer:
         binary_mask = mask.astype(np.uint8)
 
         # Calculate final statistics
-        buildable_count = np.sum(binary_mask)
+        buildable_count = np.count_nonzero(binary_mask)
         buildable_pct_final = (buildable_count / total_pixels) * 100.0
 
         stats = {
@@ -197,17 +572,32 @@ class BuildabilityEnforcer:
         resolution = heightmap.shape[0]
         pixel_size_meters = map_size_meters / resolution
 
-        # Convert to meters (CS2 height range: 0-4096m)
-        heightmap_meters = heightmap * 4096.0
-
-        # Calculate gradients
-        dy, dx = np.gradient(heightmap_meters)
-
-        # Slope ratio = sqrt(dx² + dy²) / pixel_size
-        slope_ratio = np.sqrt(dx**2 + dy**2) / pixel_size_meters
-
-        # Convert to percentage
-        return slope_ratio * 100.0
+        # Fused numba path: reads each height once and writes each slope once
+        # instead of ~8 full-array passes (scale, 2x gradient, squares, sqrt, ...)
+        kernel_args = _fused_slope_args(heightmap, pixel_size_meters)
+        if kernel_args is not None:
+            slopes = np.empty_like(heightmap)
+            _slopes_numba(heightmap, *kernel_args, slopes)
+            return slopes
+
+        if heightmap.ndim != 2:
+            return _slopes_numpy(heightmap, pixel_size_meters)
+
+        # NumPy fallback, one block of rows at a time so each block stays in
+        # cache across the gradient / square / root / scale passes (~2x faster
+        # at 4096x4096 than whole-array passes that stream through DRAM)
+        rows = heightmap.shape[0]
+        tile_rows = max(8, _SLOPE_TILE_BYTES // max(heightmap[0].nbytes, 1))
+        slopes = None
+        for start in range(0, rows, tile_rows):
+            stop = min(start + tile_rows, rows)
+            # One halo row on each side keeps central differences at the seams
+            lo, hi = max(start - 1, 0), min(stop + 1, rows)
+            block = _slopes_numpy(heightmap[lo:hi], pixel_size_meters)
+            if slopes is None:
+                slopes = np.empty(heightmap.shape, dtype=block.dtype)
+            slopes[start:stop] = block[start - lo:stop - lo]
+        return slopes
 
     @staticmethod
     def calculate_buildability_percentage(slopes: np.ndarray) -> float:
@@ -221,13 +611,66 @@ class BuildabilityEnforcer:
             Percentage of buildable terrain (0-100)
         """
         buildable_mask = slopes <= 5.0
-        return (np.sum(buildable_mask) / slopes.size) * 100.0
+        return (np.count_nonzero(buildable_mask) / slopes.size) * 100.0
+
+    @staticmethod
+    def calculate_heightmap_buildability(heightmap: np.ndarray,
+                                         map_size_meters: float = 14336.0) -> float:
+        """
+        Calculate percentage of buildable terrain (0-5% slopes) of a heightmap.
+
+        Same result as calculate_buildability_percentage(calculate_slopes(...)),
+        but with numba the slopes are thresholded as they are computed and
+        the slope map is never materialized. Use it when only the percentage
+        is needed.
+
+        Args:
+            heightmap: Normalized heightmap (0-1 range)
+            map_size_meters: Physical map size in meters (CS2 default: 14336m)
+
+        Returns:
+            Percentage of buildable terrain (0-100)
+        """
+        pixel_size_meters = map_size_meters / heightmap.shape[0]
+        kernel_args = _fused_slope_args(heightmap, pixel_size_meters)
+        if kernel_args is None:
+            return BuildabilityEnforcer.calculate_buildability_percentage(
+                BuildabilityEnforcer.calculate_slopes(heightmap, map_size_meters))
+
+        partial = np.empty(heightmap.shape[0], dtype=np.int64)
+        _buildable_counts_numba(heightmap, *kernel_args, partial)
+        return (partial.sum() / heightmap.size) * 100.0
+
+    @staticmethod
+    def calculate_slope_statistics(slopes: np.ndarray) -> dict:
+        """
+        Summary statistics of a slope map.
+
+        Same values as slopes.mean(), np.median(slopes) and
+        np.percentile(slopes, 90 / 99), but the three order statistics come
+        from a single partitioned copy (see median_and_percentiles).
+
+        Args:
+            slopes: Slope percentage array
+
+        Returns:
+            Dictionary with mean_slope, median_slope, p90_slope, p99_slope
+        """
+        median, (p90, p99) = median_and_percentiles(slopes, (90.0, 99.0))
+
+        return {
+            'mean_slope': slopes.mean(),
+            'median_slope': median,
+            'p90_slope': p90,
+            'p99_slope': p99
+        }
 
     @staticmethod
     def smart_blur(heightmap: np.ndarray,
                    problem_mask: np.ndarray,
                    sigma: float = 8.0,
-                   elevation_threshold: float = 0.05) -> np.ndarray:
+                   elevation_threshold: float = 0.05,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Apply Gaussian blur that preserves important terrain features.
 
@@ -239,26 +682,47 @@ class BuildabilityEnforcer:
             problem_mask: Binary mask of cells to smooth (1 = smooth, 0 = preserve)
             sigma: Gaussian blur sigma in pixels (default: 8)
             elevation_threshold: Elevation difference threshold for feature detection
+            out: Optional array to write the result into (may be heightmap
+                itself - the blend is per cell)
 
         Returns:
             Smoothed heightmap (only problem areas affected)
         """
+        # Local elevation statistics (variance detects features)
+        local_mean_sq = _gaussian_blur(heightmap**2, sigma=3)
+        local_mean = _gaussian_blur(heightmap, sigma=3)
+
+        # Apply Gaussian blur to entire heightmap
+        blurred = _gaussian_blur(heightmap, sigma=sigma)
+
+        # Fused numba path: feature test + blend in one pass instead of
+        # ~6 full-size temporaries (variance, masks, products)
+        if (NUMBA_AVAILABLE and heightmap.ndim == 2
+                and heightmap.dtype in (np.float32, np.float64)
+                and problem_mask.dtype == heightmap.dtype
+                and problem_mask.shape == heightmap.shape):
+            as_dtype = heightmap.dtype.type
+            if out is None:
+                out = np.empty_like(heightmap)
+            _smart_blend_numba(heightmap, blurred, local_mean_sq, local_mean, problem_mask,
+                               as_dtype(elevation_threshold), as_dtype(1.0), out)
+            return out
+
         # Calculate local elevation variance to detect features
-        local_variance = gaussian_filter(heightmap**2, sigma=3) - \
-                        gaussian_filter(heightmap, sigma=3)**2
+        local_variance = local_mean_sq - local_mean**2
 
         # Features (valleys/ridges) have high local variance
         feature_mask = local_variance > elevation_threshold
 
         # Reduce smoothing strength at features
         # problem_mask AND NOT feature_mask = areas to smooth fully
-        smooth_mask = problem_mask * (~feature_mask).astype(np.float64)
-
-        # Apply Gaussian blur to entire heightmap
-        blurred = gaussian_filter(heightmap, sigma=sigma)
+        # (in the heightmap's float precision: a float64 mask would promote
+        # every float32 blend below - and the returned heightmap - to float64)
+        work_dtype = np.result_type(heightmap.dtype, np.float32)
+        smooth_mask = problem_mask * (~feature_mask).astype(work_dtype)
 
         # Blend: original where smooth_mask=0, blurred where smooth_mask=1
-        return heightmap * (1.0 - smooth_mask) + blurred * smooth_mask
+        return np.add(heightmap * (1.0 - smooth_mask), blurred * smooth_mask, out=out)
 
     @staticmethod
     def enforce_buildability_constraint(
@@ -269,7 +733,8 @@ class BuildabilityEnforcer:
         sigma: float = 8.0,
         tolerance: float = 5.0,
         map_size_meters: float = 14336.0,
-        verbose: bool = True
+        verbose: bool = True,
+        min_improvement: float = 0.1
     ) -> Tuple[np.ndarray, dict]:
         """
         Enforce buildability constraint through iterative smoothing.
@@ -282,7 +747,8 @@ class BuildabilityEnforcer:
         1. Calculate current buildability percentage
         2. If below target, identify problem cells (buildable mask + high slope)
         3. Apply Smart Blur to problem areas only
-        4. Re-validate, repeat if needed (max 3 iterations)
+        4. Re-validate, repeat if needed (max 3 iterations, stop early once an
+           iteration no longer improves buildability)
 
         Args:
             heightmap: Normalized heightmap (0-1 range)
@@ -293,18 +759,20 @@ class BuildabilityEnforcer:
             tolerance: Acceptable deviation from target (default: ±5%)
             map_size_meters: Physical map size in meters
             verbose: Print progress messages
+            min_improvement: Stop when an iteration gains less than this many
+                percentage points of buildability (default: 0.1)
 
         Returns:
             Tuple of (enforced_heightmap, stats_dict)
             stats_dict contains: initial_pct, final_pct, iterations, problem_cells
         """
-        heightmap_working = heightmap.copy()
+        # No up-front copy: the first Smart Blur writes a new array and later
+        # ones blend into it, so the caller's heightmap is only ever read
+        heightmap_working = heightmap
 
-        # Initial buildability analysis
-        slopes_initial = BuildabilityEnforcer.calculate_slopes(
-            heightmap_working, map_size_meters)
-        initial_pct = BuildabilityEnforcer.calculate_buildability_percentage(
-            slopes_initial)
+        # Initial buildability analysis (and the cells the first pass smooths)
+        problem_mask, initial_pct, next_problem_count = _problem_cells(
+            heightmap_working, buildable_mask, map_size_meters)
 
         if verbose:
             print(f"\n[Buildability Enforcement]")
@@ -316,7 +784,7 @@ class BuildabilityEnforcer:
         if abs(initial_pct - target_pct) <= tolerance:
             if verbose:
                 print(f"  [PASS] Within tolerance, no smoothing needed")
-            return heightmap_working, {
+            return heightmap.copy(), {
                 'initial_pct': initial_pct,
                 'final_pct': initial_pct,
                 'iterations': 0,
@@ -328,18 +796,23 @@ class BuildabilityEnforcer:
             print(f"  [ENFORCING] Target not met, applying iterative smoothing...")
 
         # Iterative enforcement
+        # WHY no per-iteration recalculation: `problem_mask` and `current_pct`
+        # always describe heightmap_working (initial values, then the post-blur
+        # ones), so each iteration analyzes the heightmap once - and, with
+        # numba, without materializing a slope map
         iteration = 0
         current_pct = initial_pct
 
-        for iteration in range(1, max_iterations + 1):
-            # Calculate current slopes
-            slopes = BuildabilityEnforcer.calculate_slopes(
-                heightmap_working, map_size_meters)
+        # Working buffers reused by every iteration: the blend weights, and -
+        # for float heightmaps, once the first blur has allocated it - the
+        # working heightmap (Smart Blur's blend is per cell, so it can write
+        # over its input)
+        weights = np.empty(heightmap.shape, dtype=np.result_type(heightmap.dtype, np.float32))
+        blend_out = None
 
-            # Identify problem cells: buildable zones with slopes > 5%
-            high_slope_mask = slopes > 5.0
-            problem_mask = (buildable_mask > 0.5) & high_slope_mask
-            problem_count = np.sum(problem_mask)
+        for iteration in range(1, max_iterations + 1):
+            # Problem cells: buildable zones with slopes > 5%
+            problem_count = next_problem_count
 
             if verbose:
                 print(f"  Iteration {iteration}: {current_pct:.1f}% buildable, "
@@ -351,18 +824,21 @@ class BuildabilityEnforcer:
                 break
 
             # Apply Smart Blur to problem areas
+            np.copyto(weights, problem_mask)
             heightmap_working = BuildabilityEnforcer.smart_blur(
                 heightmap_working,
-                problem_mask.astype(np.float64),
+                weights,
                 sigma=sigma,
-                elevation_threshold=0.05
+                elevation_threshold=0.05,
+                out=blend_out
             )
+            if heightmap_working.dtype == weights.dtype:
+                blend_out = heightmap_working
 
             # Re-calculate buildability
-            slopes = BuildabilityEnforcer.calculate_slopes(
-                heightmap_working, map_size_meters)
-            current_pct = BuildabilityEnforcer.calculate_buildability_percentage(
-                slopes)
+            previous_pct = current_pct
+            problem_mask, current_pct, next_problem_count = _problem_cells(
+                heightmap_working, buildable_mask, map_size_meters, out=problem_mask)
 
             # Check if target met
             if abs(current_pct - target_pct) <= tolerance:
@@ -370,11 +846,19 @@ class BuildabilityEnforcer:
                     print(f"  [SUCCESS] Target achieved: {current_pct:.1f}%")
                 break
 
-        # Final statistics
-        slopes_final = BuildabilityEnforcer.calculate_slopes(
-            heightmap_working, map_size_meters)
-        final_pct = BuildabilityEnforcer.calculate_buildability_percentage(
-            slopes_final)
+            # Stop if smoothing has stalled (further blurs would be wasted)
+            if current_pct - previous_pct < min_improvement:
+                if verbose:
+                    print(f"  [STALLED] Improvement {current_pct - previous_pct:+.2f}% "
+                          f"< {min_improvement:.2f}%, stopping early")
+                break
+
+        # Never hand back the caller's array (no blur ran)
+        if heightmap_working is heightmap:
+            heightmap_working = heightmap.copy()
+
+        # Final statistics (buildability of the final heightmap is already known)
+        final_pct = current_pct
 
         success = abs(final_pct - target_pct) <= tolerance
 
@@ -409,16 +893,14 @@ class BuildabilityEnforcer:
         slopes = BuildabilityEnforcer.calculate_slopes(heightmap, map_size_meters)
 
         # Calculate percentages for different slope categories
-        excellent = np.sum(slopes <= 5.0) / slopes.size * 100  # 0-5%: buildable
-        acceptable = np.sum((slopes > 5.0) & (slopes <= 10.0)) / slopes.size * 100  # 5-10%
-        steep = np.sum(slopes > 10.0) / slopes.size * 100  # 10%+: scenic only
+        excellent, acceptable, steep = _slope_category_counts(slopes)
+        excellent = excellent / slopes.size * 100  # 0-5%: buildable
+        acceptable = acceptable / slopes.size * 100  # 5-10%
+        steep = steep / slopes.size * 100  # 10%+: scenic only
 
         return {
             'excellent_buildable_pct': excellent,  # CS2 standard
             'acceptable_buildable_pct': acceptable,  # Marginal
             'steep_scenic_pct': steep,  # Unbuildable
-            'mean_slope': slopes.mean(),
-            'median_slope': np.median(slopes),
-            'p90_slope': np.percentile(slopes, 90),
-            'p99_slope': np.percentile(slopes, 99)
+            **BuildabilityEnforcer.calculate_slope_statistics(slopes)
         }
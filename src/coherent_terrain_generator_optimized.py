@@ -17,10 +17,184 @@ Key Concept: MASKING
 - Result: Mountain ranges, not isolated peaks
 """
 
+import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from scipy import ndimage
 from scipy.fft import fft2, ifft2, fftfreq
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
+
+# Try to import numba for fused per-pixel kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Graceful fallback if numba not available (NumPy paths are used instead)
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+# Layer recipes for compose_terrain(), one row per layer in the order
+# (base, ranges, detail). Each row is (weight, mask_power, inverted):
+#   contribution = weight * layer_norm * mountain_mask ** mask_power
+# inverted=True uses (1 - layer_norm) instead of layer_norm.
+# Unknown terrain types fall back to 'flat'.
+_COMPOSE_RECIPES = {
+    # Mountains: Base + Ranges + Detail (BALANCED for ridges + buildable valleys)
+    # mountain_mask² focuses STRONG detail on peaks, smooth valleys for building
+    'mountains': ((0.3, 0.0, False), (0.2, 1.0, False), (0.6, 2.0, False)),
+    # Hills: Gentle base (INCREASED) + light detail everywhere (REDUCED)
+    'hills': ((0.6, 0.0, False), (0.2, 1.0, False), (0.3, 1.0, False)),
+    # Islands: Radial base + moderate detail near center
+    'islands': ((0.4, 1.0, False), (0.3, 1.0, False), (0.4, 1.5, False)),
+    # Highlands: High plateau (INCREASED for flatness) + minimal detail (REDUCED)
+    'highlands': ((0.7, 0.0, False), (0.2, 1.0, False), (0.15, 1.0, False)),
+    # Canyons: Inverted ranges (valleys) with deep cuts + some detail
+    'canyons': ((0.3, 0.0, False), (0.5, 1.0, True), (0.3, 0.0, False)),
+    # Mesas: Strong terraced base + minimal detail (no range structure)
+    'mesas': ((0.8, 0.0, False), (0.0, 0.0, False), (0.2, 1.0, False)),
+    # Flat: Mostly base, minimal detail
+    'flat': ((0.9, 0.0, False), (0.0, 0.0, False), (0.1, 1.0, False)),
+}
+
+
+@lru_cache(maxsize=4)
+def _islands_falloff(resolution: int) -> np.ndarray:
+    """
+    Radial falloff for island chains (1 at the center, 0 at the corners), squared.
+
+    Depends only on resolution, so it is built once and cached (read-only).
+    Separable: squared offsets are 1D, one float32 2D array total, and every
+    step after the broadcast add runs in place on it.
+    (distance / max_dist) == sqrt(distance_sq / max_dist**2)
+    """
+    center = resolution // 2
+    offsets_sq = (np.arange(resolution, dtype=np.float32) - center) ** 2
+    falloff = offsets_sq[:, np.newaxis] + offsets_sq[np.newaxis, :]
+    falloff *= np.float32(2.0 / resolution**2)  # 1 / max_dist**2
+    np.sqrt(falloff, out=falloff)
+    np.clip(falloff, 0, 1, out=falloff)
+    np.subtract(1.0, falloff, out=falloff)
+    np.square(falloff, out=falloff)
+    falloff.flags.writeable = False
+    return falloff
+
+
+def _mountains_mask(base_heights: np.ndarray) -> np.ndarray:
+    # Mountains in high areas of base
+    return base_heights ** 0.5  # More mountains in high areas
+
+
+def _hills_mask(base_heights: np.ndarray) -> np.ndarray:
+    # Hills everywhere, but varied
+    mask = base_heights * 0.4  # Gentle everywhere
+    mask += 0.3
+    return mask
+
+
+def _islands_mask(base_heights: np.ndarray) -> np.ndarray:
+    # Radial falloff for island chain (independent of base heights)
+    return _islands_falloff(base_heights.shape[0])
+
+
+def _highlands_mask(base_heights: np.ndarray) -> np.ndarray:
+    # High plateau with mountains on edges
+    mask = base_heights * 0.3
+    mask += 0.6
+    return mask
+
+
+def _canyons_mask(base_heights: np.ndarray) -> np.ndarray:
+    # Invert - valleys in high areas
+    return 1.0 - base_heights
+
+
+def _mesas_mask(base_heights: np.ndarray) -> np.ndarray:
+    # Terraced mask
+    # floor/divide run in place on the single scaled temporary
+    terraces = 5
+    mask = base_heights * terraces
+    np.floor(mask, out=mask)
+    mask /= terraces
+    return mask
+
+
+def _flat_mask(base_heights: np.ndarray) -> np.ndarray:
+    return np.full_like(base_heights, 0.1)  # Minimal variation
+
+
+# Mountain-mask builders for generate_base_geography(), keyed by terrain type
+# (unknown types fall back to 'flat'). Each takes the normalized float32 base
+# heights and returns the (un-smoothed) mask; results may be cached/read-only.
+_MOUNTAIN_MASK_BUILDERS = {
+    'mountains': _mountains_mask,
+    'hills': _hills_mask,
+    'islands': _islands_mask,
+    'highlands': _highlands_mask,
+    'canyons': _canyons_mask,
+    'mesas': _mesas_mask,
+    'flat': _flat_mask,
+}
+
+
+@njit(parallel=True, cache=True)
+def _compose_layers_numba(base, ranges, detail, mask, params, out):
+    """
+    Fused normalize + weighted blend of the three compose_terrain() layers.
+
+    Reads each input pixel once and writes each output pixel once, instead of
+    materializing three normalized copies plus the blend temporaries.
+
+    Args:
+        base, ranges, detail: Layer arrays (un-normalized)
+        mask: mountain_mask
+        params: (3, 4) array of (offset, scale, weight, mask_power) per layer,
+                term = (layer - offset) * scale * weight * mask ** mask_power
+        out: Output array (written in place)
+
+    Returns:
+        (min, max) of the composed result, for the final normalization
+    """
+    rows, cols = out.shape
+    row_min = np.empty(rows)
+    row_max = np.empty(rows)
+
+    for i in prange(rows):
+        lo = np.inf
+        hi = -np.inf
+        for j in range(cols):
+            m = mask[i, j]
+            value = 0.0
+            for k in range(3):
+                weight = params[k, 2]
+                if weight == 0.0:
+                    continue
+                if k == 0:
+                    x = base[i, j]
+                elif k == 1:
+                    x = ranges[i, j]
+                else:
+                    x = detail[i, j]
+                term = (x - params[k, 0]) * params[k, 1] * weight
+                if params[k, 3] != 0.0:
+                    term *= m ** params[k, 3]
+                value += term
+            out[i, j] = value
+            if value < lo:
+                lo = value
+            if value > hi:
+                hi = value
+        row_min[i] = lo
+        row_max[i] = hi
+
+    return row_min.min(), row_max.max()
 
 
 class CoherentTerrainGenerator:
@@ -175,6 +349,31 @@ class CoherentTerrainGenerator:
             # Small sigma: Standard method
             return ndimage.gaussian_filter(data, sigma=sigma)
 
+    @staticmethod
+    def _smart_gaussian_filter_many(jobs: List[tuple]) -> List[np.ndarray]:
+        """
+        Run several independent _smart_gaussian_filter() calls concurrently.
+
+        WHY threads: scipy.ndimage releases the GIL inside its filters, so
+        independent blurs of full-resolution layers overlap on multi-core
+        machines. Results are identical to calling them one after another.
+
+        Args:
+            jobs: List of (data, sigma) pairs
+
+        Returns:
+            Filtered arrays, in the same order as jobs
+        """
+        workers = min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1:
+            return [CoherentTerrainGenerator._smart_gaussian_filter(data, sigma)
+                    for data, sigma in jobs]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda job: CoherentTerrainGenerator._smart_gaussian_filter(*job), jobs
+            ))
+
     @staticmethod
     def generate_base_geography(
         heightmap: np.ndarray,
@@ -184,7 +383,7 @@ class CoherentTerrainGenerator:
         Generate base geography: WHERE should mountains/valleys be?
 
         Returns:
-            (base_heights, mountain_mask)
+            (base_heights, mountain_mask), both float32
             - base_heights: Large-scale elevation zones (0-1)
             - mountain_mask: Where mountains are allowed (0-1, higher = more mountains)
 
@@ -196,71 +395,55 @@ class CoherentTerrainGenerator:
         """
         resolution = heightmap.shape[0]
 
+        # Work in float32: these are intermediate layers, and float32's 24-bit
+        # mantissa is far finer than CS2's 16-bit export, while halving the
+        # bytes every blur and the final blend have to move.
+        # (float16 is NOT enough: its 11-bit mantissa would visibly terrace terrain)
+        heightmap = heightmap.astype(np.float32, copy=False)
+
         # Create large-scale base using multi-scale blending
         # Instead of single massive blur (creates boring gradients),
         # use multiple octaves for varied continent-scale geography
 
         # Scale 1: Continental features (largest, ~30% of map)
         scale_1 = resolution * 0.25
-        base_1 = CoherentTerrainGenerator._smart_gaussian_filter(heightmap, scale_1)
 
         # Scale 2: Regional features (~15% of map)
         scale_2 = resolution * 0.12
-        base_2 = CoherentTerrainGenerator._smart_gaussian_filter(heightmap, scale_2)
 
         # Scale 3: Sub-regional features (~6% of map)
         scale_3 = resolution * 0.06
-        base_3 = CoherentTerrainGenerator._smart_gaussian_filter(heightmap, scale_3)
 
-        # Combine with weights: emphasize larger scales but keep variation
-        base_heights = (base_1 * 0.5 +   # Continental (50%)
-                       base_2 * 0.3 +    # Regional (30%)
-                       base_3 * 0.2)     # Sub-regional (20%)
+        # The three blurs are independent - run them concurrently
+        base_1, base_2, base_3 = CoherentTerrainGenerator._smart_gaussian_filter_many(
+            [(heightmap, scale_1), (heightmap, scale_2), (heightmap, scale_3)]
+        )
 
-        # Normalize
+        # Combine with weights: emphasize larger scales but keep variation
+        # (in place - the blurred layers are fresh arrays owned by this function)
+        base_heights = base_1
+        base_heights *= 0.5                   # Continental (50%)
+        base_2 *= 0.3                         # Regional (30%)
+        base_heights += base_2
+        base_3 *= 0.2                         # Sub-regional (20%)
+        base_heights += base_3
+        del base_2, base_3
+
+        # Normalize (in place)
         base_min, base_max = base_heights.min(), base_heights.max()
-        base_heights = (base_heights - base_min) / (base_max - base_min)
+        base_heights -= base_min
+        base_heights /= (base_max - base_min)
 
         # Create mountain mask (where mountains are allowed)
-        if terrain_type == 'mountains':
-            # Mountains in high areas of base
-            mountain_mask = base_heights ** 0.5  # More mountains in high areas
-
-        elif terrain_type == 'hills':
-            # Hills everywhere, but varied
-            mountain_mask = 0.3 + base_heights * 0.4  # Gentle everywhere
-
-        elif terrain_type == 'islands':
-            # Radial falloff for island chain
-            center_y, center_x = resolution // 2, resolution // 2
-            y, x = np.ogrid[0:resolution, 0:resolution]
-            distance = np.sqrt((y - center_y)**2 + (x - center_x)**2)
-            max_dist = np.sqrt(2) * resolution / 2
-            radial_falloff = 1.0 - np.clip(distance / max_dist, 0, 1)
-            mountain_mask = radial_falloff ** 2
-
-        elif terrain_type == 'highlands':
-            # High plateau with mountains on edges
-            mountain_mask = 0.6 + base_heights * 0.3
-
-        elif terrain_type == 'canyons':
-            # Invert - valleys in high areas
-            mountain_mask = 1.0 - base_heights
-
-        elif terrain_type == 'mesas':
-            # Terraced mask
-            terraces = 5
-            mountain_mask = np.floor(base_heights * terraces) / terraces
-
-        else:  # flat
-            mountain_mask = np.ones_like(base_heights) * 0.1  # Minimal variation
+        mask_builder = _MOUNTAIN_MASK_BUILDERS.get(terrain_type, _flat_mask)
+        mountain_mask = mask_builder(base_heights)
 
         # Smooth mask for natural transitions
         # OPTIMIZATION: Use smart filter selection
         mask_sigma = resolution * 0.05
         mountain_mask = CoherentTerrainGenerator._smart_gaussian_filter(mountain_mask, mask_sigma)
 
-        return base_heights, mountain_mask
+        return base_heights, mountain_mask.astype(np.float32, copy=False)
 
     @staticmethod
     def generate_mountain_ranges(
@@ -273,7 +456,7 @@ class CoherentTerrainGenerator:
         Uses elongated/anisotropic noise to create linear features.
 
         Returns:
-            Range structure (0-1) showing where mountain chains run
+            Range structure (0-1, float32) showing where mountain chains run
 
         Performance:
             - Original: 21.0s at 4096x4096
@@ -281,38 +464,43 @@ class CoherentTerrainGenerator:
         """
         # Create directional structure using different scales in X vs Y
         # NOTE: No fixed seed - each generation should be unique!
+        # Noise is blurred as float32 (intermediate layer, see generate_base_geography)
 
         if terrain_type in ['mountains', 'highlands']:
             # Elongated ranges (anisotropic scaling)
-            noise_x = np.random.rand(resolution, resolution)
-            noise_y = np.random.rand(resolution, resolution)
+            noise_x = np.random.rand(resolution, resolution).astype(np.float32)
+            noise_y = np.random.rand(resolution, resolution).astype(np.float32)
 
             # OPTIMIZATION: Use separable filtering for anisotropic gaussians
             sigma_x = (resolution * 0.02, resolution * 0.08)
             sigma_y = (resolution * 0.08, resolution * 0.02)
 
-            range_x = CoherentTerrainGenerator._smart_gaussian_filter(noise_x, sigma_x)
-            range_y = CoherentTerrainGenerator._smart_gaussian_filter(noise_y, sigma_y)
+            range_x, range_y = CoherentTerrainGenerator._smart_gaussian_filter_many(
+                [(noise_x, sigma_x), (noise_y, sigma_y)]
+            )
 
-            # Combine to create cross-hatched ranges
-            ranges = (range_x + range_y) / 2.0
+            # Combine to create cross-hatched ranges (in place)
+            ranges = range_x
+            ranges += range_y
+            ranges /= 2.0
 
         elif terrain_type == 'canyons':
             # Strong linear valleys
-            noise = np.random.rand(resolution, resolution)
+            noise = np.random.rand(resolution, resolution).astype(np.float32)
             sigma_canyon = (resolution * 0.02, resolution * 0.12)
             ranges = CoherentTerrainGenerator._smart_gaussian_filter(noise, sigma_canyon)
 
         else:  # hills, islands, etc
             # Isotropic (equal in all directions)
-            noise = np.random.rand(resolution, resolution)
+            noise = np.random.rand(resolution, resolution).astype(np.float32)
             ranges = CoherentTerrainGenerator._smart_gaussian_filter(noise, resolution * 0.06)
 
-        # Normalize
+        # Normalize (in place)
         ranges_min, ranges_max = ranges.min(), ranges.max()
-        ranges = (ranges - ranges_min) / (ranges_max - ranges_min)
+        ranges -= ranges_min
+        ranges /= (ranges_max - ranges_min)
 
-        return ranges
+        return ranges.astype(np.float32, copy=False)
 
     @staticmethod
     def compose_terrain(
@@ -337,81 +525,52 @@ class CoherentTerrainGenerator:
             Coherent heightmap with proper geological structure
 
         Performance:
-            - Already fast (0.3s at 4096x4096)
-            - Minor optimizations: Cache normalization min/max
+            - Layer weights come from _COMPOSE_RECIPES (one lookup, no branches)
+            - With numba: normalize + blend + final min/max fused into a single
+              parallel pass (no normalized copies or blend temporaries)
+            - Layers are deliberately NOT stacked into one (3, R, R) array:
+              they arrive as separate arrays of mixed dtype (float64 detail,
+              float32 base/ranges), so stacking would copy ~3x R*R first.
+              The kernel already reads each layer once, and NumPy's SIMD
+              min()/max() beat a fused numba min/max reduction (measured
+              ~2.5x slower single-threaded at 4096x4096).
         """
-        resolution = detail_noise.shape[0]
-
-        # Normalize all inputs (OPTIMIZATION: Cache min/max)
-        detail_min, detail_max = detail_noise.min(), detail_noise.max()
-        detail_norm = (detail_noise - detail_min) / (detail_max - detail_min)
-
-        base_min, base_max = base_heights.min(), base_heights.max()
-        base_norm = (base_heights - base_min) / (base_max - base_min)
-
-        ranges_min, ranges_max = ranges.min(), ranges.max()
-        ranges_norm = (ranges - ranges_min) / (ranges_max - ranges_min)
-
-        if terrain_type == 'mountains':
-            # Mountains: Base + Ranges + Detail (BALANCED for ridges + buildable valleys)
-            # BALANCE: Sharp ridges on peaks (mountain_mask² focuses detail), smooth valleys for building
-            composed = (
-                base_norm * 0.3 +                          # Base elevation zones (smooth valleys)
-                ranges_norm * 0.2 * mountain_mask +        # Range structure (masked)
-                detail_norm * 0.6 * (mountain_mask ** 2)   # STRONG detail on peaks for sharp ridges
-            )
-
-        elif terrain_type == 'hills':
-            # Hills: Gentle base + light detail everywhere
-            # Keep smooth for building
-            composed = (
-                base_norm * 0.6 +                          # Gentle base (INCREASED)
-                ranges_norm * 0.2 * mountain_mask +        # Some variation
-                detail_norm * 0.3 * mountain_mask          # Light detail (REDUCED)
-            )
-
-        elif terrain_type == 'islands':
-            # Islands: Radial base + moderate detail
-            composed = (
-                base_norm * 0.4 * mountain_mask +          # Island shape
-                ranges_norm * 0.3 * mountain_mask +        # Some ranges
-                detail_norm * 0.4 * (mountain_mask ** 1.5) # Detail near center
-            )
-
-        elif terrain_type == 'highlands':
-            # Highlands: High base + moderate ranges
-            # Should be relatively flat plateau with some variation
-            composed = (
-                base_norm * 0.7 +                          # High plateau (INCREASED for flatness)
-                ranges_norm * 0.2 * mountain_mask +        # Some ranges
-                detail_norm * 0.15 * mountain_mask         # Minimal detail (REDUCED)
-            )
-
-        elif terrain_type == 'canyons':
-            # Canyons: Inverted ranges with deep cuts
-            composed = (
-                base_norm * 0.3 +                          # Base
-                (1.0 - ranges_norm) * 0.5 * mountain_mask + # Inverted ranges (valleys)
-                detail_norm * 0.3                          # Some detail
-            )
-
-        elif terrain_type == 'mesas':
-            # Mesas: Terraced base + minimal detail
-            composed = (
-                base_norm * 0.8 +                          # Strong terraced base
-                detail_norm * 0.2 * mountain_mask          # Minimal detail
+        recipe = _COMPOSE_RECIPES.get(terrain_type, _COMPOSE_RECIPES['flat'])
+
+        # Per-layer normalization folded into (offset, scale) so the blend never
+        # materializes normalized copies. Layers with zero weight are skipped
+        # entirely (mesas/flat never read the range structure).
+        # Inverted layers: 1 - (x - min)/(max - min) == (x - max)/(min - max)
+        params = np.zeros((3, 4), dtype=np.float64)
+        for k, (layer, (weight, mask_power, inverted)) in enumerate(
+                zip((base_heights, ranges, detail_noise), recipe)):
+            if weight == 0.0:
+                continue
+            layer_min, layer_max = np.float64(layer.min()), np.float64(layer.max())
+            if inverted:
+                layer_min, layer_max = layer_max, layer_min
+            params[k] = (layer_min, 1.0 / (layer_max - layer_min), weight, mask_power)
+
+        if NUMBA_AVAILABLE:
+            composed = np.empty(detail_noise.shape, dtype=np.float64)
+            comp_min, comp_max = _compose_layers_numba(
+                base_heights, ranges, detail_noise, mountain_mask, params, composed
             )
-
-        else:  # flat
-            # Flat: Mostly base, minimal detail
-            composed = (
-                base_norm * 0.9 +
-                detail_norm * 0.1 * mountain_mask
-            )
-
-        # Normalize final result
-        comp_min, comp_max = composed.min(), composed.max()
-        composed = (composed - comp_min) / (comp_max - comp_min)
+        else:
+            composed = np.zeros(detail_noise.shape, dtype=np.float64)
+            for layer, (offset, scale, weight, mask_power) in zip(
+                    (base_heights, ranges, detail_noise), params):
+                if weight == 0.0:
+                    continue
+                term = (layer - offset) * (scale * weight)
+                if mask_power != 0.0:
+                    term *= mountain_mask ** mask_power
+                composed += term
+            comp_min, comp_max = composed.min(), composed.max()
+
+        # Normalize final result (in place)
+        composed -= comp_min
+        composed /= (comp_max - comp_min)
 
         return composed
 
@@ -458,17 +617,23 @@ class CoherentTerrainGenerator:
         # Step 2: Create elevation-based blend mask
         # WHY elevation-based: Only enhance high areas (ridges), preserve valleys
         # Elevation weight: 0 below ridge_threshold, ramping to 1 at max elevation
-        elevation_normalized = (heightmap - ridge_threshold) / (1.0 - ridge_threshold)
-        blend_mask = np.clip(elevation_normalized, 0, 1)
+        # (all steps below run in place on blend_mask / smoothed / enhanced)
+        blend_mask = heightmap - ridge_threshold
+        blend_mask /= (1.0 - ridge_threshold)
+        np.clip(blend_mask, 0, 1, out=blend_mask)
 
         # Apply blend_strength to control overall effect intensity
-        blend_mask = blend_mask * blend_strength
+        blend_mask *= blend_strength
 
         # Step 3: Blend smoothed terrain with original
         # WHY weighted blending: Smooth transition, preserves detail where needed
         # Low elevations (valleys): mostly original (blend_mask ≈ 0)
         # High elevations (ridges): blend of original and smoothed (blend_mask ≈ blend_strength)
-        enhanced = heightmap * (1.0 - blend_mask) + smoothed * blend_mask
+        # enhanced = heightmap * (1 - blend_mask) + smoothed * blend_mask
+        enhanced = np.subtract(1.0, blend_mask)
+        enhanced *= heightmap
+        smoothed *= blend_mask
+        enhanced += smoothed
 
         # No normalization needed - weighted blending preserves [0, 1] range naturally
         # This maintains threshold relationships and prevents terrain destruction
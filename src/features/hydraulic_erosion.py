@@ -264,6 +264,11 @@ class HydraulicErosionSimulator:
         # Pad for border handling
         padded = np.pad(terrain, 1, mode='edge')
 
+        # Slope and mask buffers are reused across directions; masked updates
+        # use copyto(where=) instead of boolean fancy indexing
+        slopes = None
+        mask = np.empty((height, width), dtype=bool)
+
         # Check each of 8 directions
         for dir_idx in range(8):
             dy, dx = self.DIRECTIONS[dir_idx]
@@ -273,12 +278,13 @@ class HydraulicErosionSimulator:
             neighbor_heights = padded[1+dy:1+dy+height, 1+dx:1+dx+width]
 
             # Calculate slopes (positive = downhill)
-            slopes = (terrain - neighbor_heights) / distance
+            slopes = np.subtract(terrain, neighbor_heights, out=slopes)
+            slopes /= distance
 
             # Update flow direction where slope is steeper
-            mask = slopes > max_slopes
-            flow_dirs[mask] = dir_idx
-            max_slopes[mask] = slopes[mask]
+            np.greater(slopes, max_slopes, out=mask)
+            np.copyto(flow_dirs, dir_idx, where=mask)
+            np.copyto(max_slopes, slopes, where=mask, casting='same_kind')
 
         return flow_dirs, max_slopes
 
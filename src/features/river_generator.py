@@ -122,6 +122,12 @@ class RiverGenerator:
         # For each direction, compute slopes in a vectorized manner
         max_slopes = np.full((self.height, self.width), 0.0, dtype=np.float32)
 
+        # Slope and mask buffers are reused across the 8 directions, and the
+        # masked updates use copyto(where=) instead of boolean fancy indexing
+        # (no gathered temporaries, no scattered writes)
+        slopes = None
+        mask = np.empty((self.height, self.width), dtype=bool)
+
         for dir_idx, (dy, dx) in enumerate(self.DIRECTIONS):
             # Extract neighbor heights using slicing
             # Account for padding offset
@@ -129,12 +135,13 @@ class RiverGenerator:
 
             # Calculate slopes
             distance = 1.414 if (dy != 0 and dx != 0) else 1.0
-            slopes = (self.heightmap - neighbor_heights) / distance
+            slopes = np.subtract(self.heightmap, neighbor_heights, out=slopes)
+            slopes /= distance
 
             # Update flow direction where this slope is steeper
-            mask = slopes > max_slopes
-            flow_dir[mask] = dir_idx
-            max_slopes[mask] = slopes[mask]
+            np.greater(slopes, max_slopes, out=mask)
+            np.copyto(flow_dir, dir_idx, where=mask)
+            np.copyto(max_slopes, slopes, where=mask, casting='same_kind')
 
         elapsed = time.time() - start
         print(f"[RIVER DEBUG] calculate_flow_direction() VECTORIZED completed in {elapsed:.2f}s")
@@ -19,9 +19,35 @@ Why This Design:
 import numpy as np
 from scipy import ndimage
 from typing import Tuple, Optional
+from functools import lru_cache
 from ..state_manager import Command
 
 
+@lru_cache(maxsize=32)
+def _gaussian_brush(radius: int) -> np.ndarray:
+    """
+    Gaussian falloff brush kernel of the given radius, (2r+1, 2r+1).
+
+    Cached per radius - interactive editing applies the same brush size
+    stroke after stroke. The returned array is shared, so it is read-only.
+    """
+    size = radius * 2 + 1
+    center = radius
+
+    # Create coordinate grid
+    y, x = np.ogrid[:size, :size]
+
+    # Calculate distance from center
+    distance = np.sqrt((x - center)**2 + (y - center)**2)
+
+    # Gaussian falloff (sigma = radius/2 for nice falloff)
+    sigma = radius / 2.0
+    brush = np.exp(-(distance**2) / (2 * sigma**2))
+    brush.flags.writeable = False
+
+    return brush
+
+
 class TerrainEditor:
     """
     Provides terrain editing tools for manual heightmap modification.
@@ -315,27 +341,15 @@ class TerrainEditor:
             radius: Brush radius in pixels
 
         Returns:
-            2D array with Gaussian falloff (peak=1.0 at center)
+            2D array with Gaussian falloff (peak=1.0 at center), shared and
+            read-only (see _gaussian_brush)
 
         Why Gaussian:
         - Smooth natural falloff
         - No hard edges
         - Standard in image editing
         """
-        size = radius * 2 + 1
-        center = radius
-
-        # Create coordinate grid
-        y, x = np.ogrid[:size, :size]
-
-        # Calculate distance from center
-        distance = np.sqrt((x - center)**2 + (y - center)**2)
-
-        # Gaussian falloff (sigma = radius/2 for nice falloff)
-        sigma = radius / 2.0
-        brush = np.exp(-(distance**2) / (2 * sigma**2))
-
-        return brush
+        return _gaussian_brush(radius)
 
 
 # Command classes for undo/redo support
@@ -11,9 +11,131 @@ Date: 2025-10-10
 import numpy as np
 import time
 from typing import Tuple, Dict, List
-from scipy.ndimage import gaussian_filter
 
-from src.buildability_enforcer import BuildabilityEnforcer
+# WHY the enforcer's blur: one guarded implementation (dtype/kernel-size
+# fallbacks to scipy) shared by both smoothing loops
+from src.buildability_enforcer import BuildabilityEnforcer, _gaussian_blur
+
+# Try to import numba for the fused masked-blend kernel
+# NOTE: The kernels below are compiled with cache=True (compiled once per
+# environment, loaded from __pycache__ afterwards). fastmath=True was measured
+# at 4096x4096 and gave no gain (blend 20ms vs 21ms, change stats 35ms vs 39ms:
+# memory bound, and the mask branch blocks vectorizing the reductions), so it
+# is left off to keep clip/NaN semantics identical to NumPy.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Graceful fallback if numba not available (NumPy path is used instead)
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+    prange = range
+    NUMBA_AVAILABLE = False
+
+@njit(parallel=True, cache=True)
+def _change_stats_numba(original, adjusted, mask):
+    """Row-parallel |adjusted - original| sum/max, plus sum/count under mask."""
+    rows, cols = original.shape
+    row_sum = np.zeros(rows)
+    row_max = np.zeros(rows)
+    row_mask_sum = np.zeros(rows)
+    row_mask_count = np.zeros(rows, dtype=np.int64)
+    for i in prange(rows):
+        total = 0.0
+        peak = 0.0
+        masked = 0.0
+        count = 0
+        for j in range(cols):
+            diff = abs(np.float64(adjusted[i, j]) - np.float64(original[i, j]))
+            total += diff
+            if diff > peak:
+                peak = diff
+            if mask[i, j]:
+                masked += diff
+                count += 1
+        row_sum[i] = total
+        row_max[i] = peak
+        row_mask_sum[i] = masked
+        row_mask_count[i] = count
+    return row_sum.sum(), row_max.max(), row_mask_sum.sum(), row_mask_count.sum()
+
+
+def _change_stats(original: np.ndarray, adjusted: np.ndarray,
+                  mask: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Mean and max absolute terrain change, and mean change under mask.
+
+    WHY: The NumPy version materializes |adjusted - original| and then
+    gathers it again through the boolean mask. The numba kernel reads both
+    maps and the mask once and reduces all three statistics together.
+    """
+    if NUMBA_AVAILABLE:
+        total, peak, masked, count = _change_stats_numba(original, adjusted, mask)
+        return total / original.size, peak, (masked / count if count else 0.0)
+
+    terrain_diff = np.abs(adjusted - original)
+    masked_mean = np.mean(terrain_diff[mask]) if np.any(mask) else 0.0
+    return float(np.mean(terrain_diff)), float(np.max(terrain_diff)), float(masked_mean)
+
+
+def _blur_window(mask: np.ndarray, sigma: float):
+    """
+    Region that a blur needs to cover for a blend that only reads it under mask.
+
+    Returns None if the mask is empty, otherwise (tile, inner): tile is the
+    mask's bounding box grown by the Gaussian kernel radius (clipped to the
+    map) and inner locates the bounding box within the tile. Blurring just the
+    tile gives pixels inside the bounding box exactly the same neighbourhood -
+    and the same 'reflect' boundary at map edges - as a full-map blur (OpenCV
+    may still round the last bit differently on a different tile width).
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+
+    radius = int(4.0 * sigma + 0.5)
+    r0, r1 = max(rows[0] - radius, 0), min(rows[-1] + 1 + radius, mask.shape[0])
+    c0, c1 = max(cols[0] - radius, 0), min(cols[-1] + 1 + radius, mask.shape[1])
+    tile = (slice(r0, r1), slice(c0, c1))
+    inner = (slice(rows[0] - r0, rows[-1] + 1 - r0), slice(cols[0] - c0, cols[-1] + 1 - c0))
+    return tile, inner
+
+
+@njit(parallel=True, cache=True)
+def _blend_clipped_numba(mask, smoothed, original, out):
+    """out = clip(where(mask, smoothed, original), 0, 1) in one pass over rows."""
+    rows, cols = original.shape
+    for i in prange(rows):
+        for j in range(cols):
+            value = smoothed[i, j] if mask[i, j] else original[i, j]
+            if value < 0.0:
+                value = 0.0
+            elif value > 1.0:
+                value = 1.0
+            out[i, j] = value
+
+
+def _blend_clipped(mask: np.ndarray, smoothed: np.ndarray,
+                   original: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Write clip(where(mask, smoothed, original), 0, 1) into out.
+
+    WHY: np.where followed by np.clip allocates two full-size temporaries
+    per adjustment iteration. The numba kernel fuses select + clip into a
+    single parallel pass over preallocated memory.
+    """
+    if NUMBA_AVAILABLE:
+        _blend_clipped_numba(mask, smoothed, original, out)
+    else:
+        np.copyto(out, original)
+        np.copyto(out, smoothed, where=mask)
+        np.clip(out, 0.0, 1.0, out=out)
+    return out
 
 
 class ConstraintVerifier:
@@ -230,9 +352,9 @@ class ConstraintVerifier:
 
         # Calculate percentages
         total_pixels = slopes.size
-        buildable_pct = 100.0 * np.sum(buildable_mask) / total_pixels
-        near_buildable_pct = 100.0 * np.sum(near_buildable_mask) / total_pixels
-        unbuildable_pct = 100.0 * np.sum(unbuildable_mask) / total_pixels
+        buildable_pct = 100.0 * np.count_nonzero(buildable_mask) / total_pixels
+        near_buildable_pct = 100.0 * np.count_nonzero(near_buildable_mask) / total_pixels
+        unbuildable_pct = 100.0 * np.count_nonzero(unbuildable_mask) / total_pixels
 
         return {
             'buildable_mask': buildable_mask,
@@ -274,7 +396,9 @@ class ConstraintVerifier:
         Returns:
             Tuple of (adjusted_terrain, adjustment_statistics)
         """
-        adjusted = terrain.copy()
+        # No up-front copy: iterations write into their own buffers, so the
+        # caller's terrain is only read (first iteration's "previous" map)
+        adjusted = terrain
         near_buildable_mask = classification['near_buildable_mask']
 
         if verbose:
@@ -283,31 +407,54 @@ class ConstraintVerifier:
 
         iterations_performed = 0
         improvement_per_iteration = []
+        # `slopes` already describes the unadjusted terrain; carry the
+        # buildability of the current iterate forward instead of
+        # recomputing the previous iterate's slopes every iteration
+        initial_buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(slopes)
+        current_pct = initial_buildable_pct
+        # Double buffer: each iteration writes into the array the previous
+        # iteration no longer needs
+        spare = np.empty_like(adjusted)
+
+        # Blur only the bounding box of the near-buildable pixels (none at all
+        # if the mask is empty) - the blend never reads the blur elsewhere
+        window = _blur_window(near_buildable_mask, sigma)
+        full_window = window is not None and all(
+            (sl.start, sl.stop) == (0, n) for sl, n in zip(window[0], adjusted.shape))
+        # Partial windows blur into a reused buffer (only read inside the window)
+        tile_buffer = np.empty_like(adjusted) if window is not None and not full_window else None
 
         for iteration in range(max_iterations):
             # Smooth only near-buildable regions
-            smoothed = gaussian_filter(adjusted, sigma=sigma, mode='reflect')
+            if full_window:
+                smoothed = _gaussian_blur(adjusted, sigma)
+            elif window is not None:
+                tile, inner = window
+                blurred = _gaussian_blur(np.ascontiguousarray(adjusted[tile]), sigma)
+                tile_buffer[tile][inner] = blurred[inner]
+                smoothed = tile_buffer
+            else:
+                smoothed = adjusted
 
             # Apply smoothing only to near-buildable areas
             # Preserve buildable and unbuildable areas unchanged
-            adjusted_new = np.where(near_buildable_mask, smoothed, adjusted)
-
-            # Clip to valid range [0, 1] (gaussian_filter can produce out-of-range values)
-            adjusted_new = np.clip(adjusted_new, 0.0, 1.0)
+            # Clip to valid range [0, 1] (the blur can produce out-of-range values)
+            adjusted_new = _blend_clipped(near_buildable_mask, smoothed, adjusted, spare)
 
             # Calculate new buildability
-            new_slopes = BuildabilityEnforcer.calculate_slopes(adjusted_new, self.map_size_meters)
-            new_buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(new_slopes)
+            new_buildable_pct = BuildabilityEnforcer.calculate_heightmap_buildability(
+                adjusted_new, self.map_size_meters)
 
-            improvement = new_buildable_pct - BuildabilityEnforcer.calculate_buildability_percentage(
-                BuildabilityEnforcer.calculate_slopes(adjusted, self.map_size_meters)
-            )
+            improvement = new_buildable_pct - current_pct
             improvement_per_iteration.append(improvement)
 
             if verbose:
                 print(f"      Iteration {iteration + 1}: {new_buildable_pct:.1f}% buildable (+{improvement:.1f}%)")
 
-            adjusted = adjusted_new
+            adjusted, spare = adjusted_new, adjusted
+            if spare is terrain:
+                spare = np.empty_like(terrain)
+            current_pct = new_buildable_pct
             iterations_performed += 1
 
             # Stop if target achieved
@@ -323,18 +470,12 @@ class ConstraintVerifier:
                 break
 
         # Calculate total improvement
-        final_slopes = BuildabilityEnforcer.calculate_slopes(adjusted, self.map_size_meters)
-        final_buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(final_slopes)
-        initial_buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(slopes)
+        final_buildable_pct = current_pct
         total_improvement = final_buildable_pct - initial_buildable_pct
 
-        # Calculate terrain changes
-        terrain_diff = np.abs(adjusted - terrain)
-        mean_change = np.mean(terrain_diff)
-        max_change = np.max(terrain_diff)
-
-        # Changes in near-buildable regions only
-        near_buildable_change = np.mean(terrain_diff[near_buildable_mask]) if np.any(near_buildable_mask) else 0.0
+        # Calculate terrain changes (overall and in near-buildable regions only)
+        mean_change, max_change, near_buildable_change = _change_stats(
+            terrain, adjusted, near_buildable_mask)
 
         adjustment_stats = {
             'iterations_performed': iterations_performed,
@@ -349,6 +490,10 @@ class ConstraintVerifier:
             'regions_smoothed_pct': float(classification['near_buildable_pct'])
         }
 
+        # Never hand back the caller's array (no iteration ran)
+        if adjusted is terrain:
+            adjusted = terrain.copy()
+
         return adjusted, adjustment_stats
 
     def _generate_recommendations(
@@ -429,8 +429,7 @@ class HydraulicErosionSimulator:
 
         # Calculate initial buildability
         from ..buildability_enforcer import BuildabilityEnforcer
-        initial_slopes = BuildabilityEnforcer.calculate_slopes(eroded, self.map_size_meters)
-        initial_buildable = BuildabilityEnforcer.calculate_buildability_percentage(initial_slopes)
+        initial_buildable = BuildabilityEnforcer.calculate_heightmap_buildability(eroded, self.map_size_meters)
 
         if verbose:
             print(f"  Initial buildability: {initial_buildable:.1f}%")
@@ -486,8 +485,7 @@ class HydraulicErosionSimulator:
             print(f"  Amplification: {eroded.max() / original_amplitude:.2f}x")
 
         # Calculate final buildability AFTER normalization
-        final_slopes = BuildabilityEnforcer.calculate_slopes(eroded, self.map_size_meters)
-        final_buildable = BuildabilityEnforcer.calculate_buildability_percentage(final_slopes)
+        final_buildable = BuildabilityEnforcer.calculate_heightmap_buildability(eroded, self.map_size_meters)
 
         if verbose:
             print(f"\n[Erosion Complete]")
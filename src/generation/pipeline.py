@@ -445,6 +445,7 @@ class TerrainGenerationPipeline:
             terrain, self.map_size_meters
         )
         final_buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(final_slopes)
+        final_slope_stats = BuildabilityEnforcer.calculate_slope_statistics(final_slopes)
 
         stage6_time = time.time() - stage6_start
 
@@ -483,10 +484,10 @@ class TerrainGenerationPipeline:
 
             # Final metrics
             'final_buildable_pct': float(final_buildable_pct),
-            'final_mean_slope': float(final_slopes.mean()),
-            'final_median_slope': float(np.median(final_slopes)),
-            'final_p90_slope': float(np.percentile(final_slopes, 90)),
-            'final_p99_slope': float(np.percentile(final_slopes, 99)),
+            'final_mean_slope': float(final_slope_stats['mean_slope']),
+            'final_median_slope': float(final_slope_stats['median_slope']),
+            'final_p90_slope': float(final_slope_stats['p90_slope']),
+            'final_p99_slope': float(final_slope_stats['p99_slope']),
             'final_min_height': float(terrain.min()),
             'final_max_height': float(terrain.max()),
 
@@ -171,20 +171,18 @@ class ZoneWeightedTerrainGenerator:
         )
 
         buildable_pct = BuildabilityEnforcer.calculate_buildability_percentage(slopes)
+        slope_stats = BuildabilityEnforcer.calculate_slope_statistics(slopes)
 
         if verbose:
             print(f"  Buildable percentage: {buildable_pct:.1f}% (target: 40-45%)")
-            print(f"  Mean slope: {slopes.mean():.2f}%")
-            print(f"  Median slope: {np.median(slopes):.2f}%")
-            print(f"  90th percentile slope: {np.percentile(slopes, 90):.2f}%")
+            print(f"  Mean slope: {slope_stats['mean_slope']:.2f}%")
+            print(f"  Median slope: {slope_stats['median_slope']:.2f}%")
+            print(f"  90th percentile slope: {slope_stats['p90_slope']:.2f}%")
 
         # Compile statistics
         stats = {
             'buildable_percent': buildable_pct,
-            'mean_slope': slopes.mean(),
-            'median_slope': np.median(slopes),
-            'p90_slope': np.percentile(slopes, 90),
-            'p99_slope': np.percentile(slopes, 99),
+            **slope_stats,
             'min_height': terrain_normalized.min(),
             'max_height': terrain_normalized.max(),
             'mean_amplitude_buildable': buildable_amp if 'buildable_amp' in locals() else amplitude_map.min(),
@@ -16,6 +16,7 @@ import numpy as np
 from perlin_noise import PerlinNoise
 from opensimplex import OpenSimplex
 from typing import Optional, Tuple
+from functools import lru_cache
 import math
 from .progress_tracker import ProgressTracker
 
@@ -29,6 +30,171 @@ except ImportError as e:
     print(f"[NOISE_GEN] FastNoiseLite import FAILED: {e}")
     print("[NOISE_GEN] WARNING: Will use SLOW pure Python fallback (60-120s per generation)")
 
+# Optional: OpenCV morphology (SIMD) for control-map smoothing with small disks
+# Graceful fallback to the run-length decomposition if unavailable
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+@lru_cache(maxsize=8)
+def _circular_structure(radius: int) -> np.ndarray:
+    """
+    Disk-shaped boolean structuring element of the given radius, (2r+1, 2r+1).
+
+    Built with open-grid broadcasting (no per-pixel Python loop) and cached per
+    radius - control maps are regenerated with the same smoothing radius.
+    The returned array is shared, so it is read-only.
+    """
+    y, x = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    structure = x * x + y * y <= radius * radius
+    structure.flags.writeable = False
+    return structure
+
+
+def _percentile_threshold(values: np.ndarray, percent: float):
+    """
+    np.percentile(values, percent) (default 'linear' method) via one introselect.
+
+    WHY: np.percentile partitions around BOTH neighbouring order statistics,
+    which takes numpy's slow multi-kth path (~0.35s at 4096x4096). Partitioning
+    around the upper one and taking the max of the lower part gives the same two
+    values in ~0.07s; they are interpolated exactly as numpy's _lerp does.
+
+    Args:
+        values: Array of any shape (not modified)
+        percent: Percentile in [0, 100]
+
+    Returns:
+        Same value (and dtype) as np.percentile(values, percent)
+    """
+    flat = values.ravel()
+    n = flat.size
+    index = percent / 100.0 * (n - 1)
+    lower = int(np.floor(index))
+    t = index - lower
+
+    if t == 0.0 or lower + 1 >= n:
+        return np.partition(flat, lower)[lower]
+
+    partitioned = np.partition(flat, lower + 1)
+    upper_value = partitioned[lower + 1]
+    lower_value = partitioned[:lower + 1].max()
+    diff = upper_value - lower_value
+    if t >= 0.5:
+        return upper_value - diff * (1 - t)
+    return lower_value + diff * t
+
+
+# Radius below which OpenCV's disk scan beats the run-length decomposition
+# (cv2 cost grows with the disk area, run-length cost with its diameter)
+_CV2_MORPHOLOGY_MAX_RADIUS = 8
+
+
+def _disk_row_runs(structure: np.ndarray):
+    """
+    Run-length encoding of a disk: (dy, half_width) per structuring-element row.
+
+    Every row of a disk is one centred run, so row dy covers dx in
+    [-half_width, half_width]. Sorted by half width (outermost rows first).
+    """
+    radius = structure.shape[0] // 2
+    runs = [(dy, int(np.count_nonzero(structure[dy + radius])) // 2)
+            for dy in range(-radius, radius + 1)]
+    return sorted(runs, key=lambda run: run[1])
+
+
+def _runlength_binary_dilation(mask: np.ndarray, structure: np.ndarray) -> np.ndarray:
+    """
+    Binary dilation by a disk, decomposed into its row runs.
+
+    The horizontal dilation for each run width is grown incrementally in one
+    buffer (two shifted ORs per extra pixel of half width), and each disk row
+    ORs it into the output shifted by dy: O(4r) full-map passes instead of
+    O(pi r^2) neighbour reads per pixel. Exact - the runs ARE the disk.
+    Pixels outside the map count as 0.
+    """
+    rows = mask.shape[0]
+    dilated = np.zeros_like(mask)
+    horizontal = mask.copy()
+    width = 0
+    for dy, half_width in _disk_row_runs(structure):
+        while width < half_width:
+            width += 1
+            horizontal[:, width:] |= mask[:, :-width]
+            horizontal[:, :-width] |= mask[:, width:]
+        if dy >= 0:
+            dilated[:rows - dy] |= horizontal[dy:]
+        else:
+            dilated[-dy:] |= horizontal[:rows + dy]
+    return dilated
+
+
+def _runlength_binary_erosion(mask: np.ndarray, structure: np.ndarray) -> np.ndarray:
+    """
+    Binary erosion by a disk, decomposed into its row runs (see
+    _runlength_binary_dilation). Pixels outside the map count as 0, so any
+    pixel whose disk reaches past the border is cleared.
+    """
+    rows, cols = mask.shape
+    eroded = np.ones_like(mask)
+    horizontal = mask.copy()
+    width = 0
+    for dy, half_width in _disk_row_runs(structure):
+        while width < half_width:
+            width += 1
+            horizontal[:, width:] &= mask[:, :-width]
+            horizontal[:, :-width] &= mask[:, width:]
+            horizontal[:, :width] = False
+            horizontal[:, cols - width:] = False
+        if dy >= 0:
+            eroded[:rows - dy] &= horizontal[dy:]
+            eroded[rows - dy:] = False
+        else:
+            eroded[-dy:] &= horizontal[:rows + dy]
+            eroded[:-dy] = False
+    return eroded
+
+
+def _close_with_disk(mask: np.ndarray, radius: int) -> np.ndarray:
+    """
+    Morphological closing (dilate, then erode) of a bool mask with a disk.
+
+    Pixels outside the map count as background for both steps (matching
+    scipy's binary_dilation/binary_erosion defaults).
+
+    Args:
+        mask: 2D bool array
+        radius: Disk radius in pixels
+
+    Returns:
+        Closed 2D bool array
+
+    Performance (4096x4096):
+        - OpenCV (if installed, radius < 8): ~0.03s at radius 3, ~0.09s at 6
+        - Run-length decomposition (pure NumPy): ~0.07s at radius 3,
+          ~0.15s at 10, ~0.42s at 25 (OpenCV: 0.29s / 1.36s)
+        Both give the same result as scipy.ndimage (~5.5s at radius 10), which
+        is therefore not used; neither is FFT convolution (~1.6s).
+
+    NOTE: The disk is NOT decomposed into a sequence of 3x3 (cross/square)
+    footprints. That composite is an octagon, not the disk (36 of 317 pixels
+    differ at radius 10, changing ~2000 map pixels at 2048x2048). The row-run
+    decomposition used instead is exact.
+    """
+    structure = _circular_structure(radius)
+
+    if CV2_AVAILABLE and radius < _CV2_MORPHOLOGY_MAX_RADIUS:
+        kernel = structure.view(np.uint8)
+        pixels = mask.view(np.uint8)
+        closed = cv2.dilate(pixels, kernel, borderType=cv2.BORDER_CONSTANT, borderValue=0)
+        cv2.erode(closed, kernel, dst=closed, borderType=cv2.BORDER_CONSTANT, borderValue=0)
+        return closed.view(bool)
+
+    return _runlength_binary_erosion(_runlength_binary_dilation(mask, structure), structure)
+
 
 class NoiseGenerator:
     """
@@ -39,20 +205,156 @@ class NoiseGenerator:
     at different scales and amplitudes - this is called Fractal Brownian Motion (FBM).
     """
 
-    def __init__(self, seed: Optional[int] = None):
+    def __init__(self, seed: Optional[int] = None, cache_perlin: bool = False):
         """
         Initialize noise generator with optional seed.
 
         Args:
             seed: Random seed for reproducible terrain (optional)
+            cache_perlin: Keep the last generate_perlin() result so repeated
+                calls with identical parameters skip regeneration (default: False).
+                Costs one extra full-resolution float64 array (128MB at
+                4096x4096) held by this instance, plus one copy per call.
 
         Why seeds matter:
         Seeds allow you to recreate the exact same terrain, which is crucial
         for iterative design or sharing map configurations.
         """
-        self.seed = seed if seed is not None else np.random.randint(0, 10000)
+        # Fresh OS-entropy Generator: unseeded generators no longer draw from (or
+        # depend on) the process-wide legacy np.random state
+        self.seed = seed if seed is not None else int(np.random.default_rng().integers(0, 10000))
         self.opensimplex = OpenSimplex(seed=self.seed)
 
+        # Sample-coordinate grids keyed by resolution (built lazily, see
+        # _get_coordinate_grid). WHY: recursive warping needs the full (x, y)
+        # grid; at 4096x4096 rebuilding it costs ~128MB per call.
+        # (Unwarped passes stream row bands instead, see _generate_noise_grid)
+        self._coordinate_grids = {}
+
+        # Single FastNoiseLite instance shared by every vectorized pass
+        # (created lazily, reconfigured per call by _configure_fastnoise)
+        self._fastnoise = None
+
+        # Last generate_perlin() result as (parameter key, heightmap), only
+        # kept when cache_perlin is set. WHY: parameter sweeps (uplift,
+        # amplitudes, masks) re-request the identical multi-octave field,
+        # which costs seconds at 4096x4096
+        # WHY opt-in: one-off callers would pay the copy and memory for nothing
+        self.cache_perlin = cache_perlin
+        self._perlin_cache = None
+
+    def _configure_fastnoise(self,
+                             seed: int,
+                             noise_type,
+                             octaves: int,
+                             gain: float,
+                             lacunarity: float,
+                             frequency: float) -> 'FastNoiseLite':
+        """
+        Return the shared FastNoiseLite object configured for one FBm pass.
+
+        WHY: Every layer (terrain, warp, control map) used to construct and fully
+        configure its own FastNoiseLite. The object holds no per-call state, so a
+        single instance is reused and only its parameters are reassigned.
+
+        Args:
+            seed: Noise seed
+            noise_type: NoiseType enum value
+            octaves: FBm octaves
+            gain: Amplitude multiplier per octave (persistence)
+            lacunarity: Frequency multiplier per octave
+            frequency: Base frequency (1 / scale)
+
+        Returns:
+            The shared FastNoiseLite instance
+
+        NOTE: The instance is reconfigured by the next call - use it immediately.
+        Domain warp settings are reset to their defaults; callers that need
+        warping set them after this call.
+        """
+        noise = self._fastnoise
+        if noise is None:
+            noise = self._fastnoise = FastNoiseLite(seed=seed)
+        noise.seed = seed
+        noise.noise_type = noise_type
+        noise.fractal_type = FractalType.FractalType_FBm
+        noise.fractal_octaves = octaves
+        noise.fractal_gain = gain
+        noise.fractal_lacunarity = lacunarity
+        noise.frequency = frequency
+        noise.domain_warp_amp = 1.0
+        noise.domain_warp_type = DomainWarpType.DomainWarpType_OpenSimplex2
+        return noise
+
+    # Rows per band in _generate_noise_grid(): 256 rows at 4096 wide is an
+    # 8MB coordinate buffer instead of the full 128MB grid
+    _BAND_ROWS = 256
+
+    def _generate_noise_grid(self, noise: 'FastNoiseLite', resolution: int) -> np.ndarray:
+        """
+        Sample a configured FastNoiseLite on the unwarped pixel grid, in row bands.
+
+        WHY: The noise is a pure function of absolute (x, y), so the heightmap can
+        be produced band by band. Each band's coordinates are written into one
+        small reused buffer (x row is shared by every band, only y changes) and
+        its values go straight into the output - the full coordinate grid is
+        never materialized.
+
+        Args:
+            noise: Configured FastNoiseLite (see _configure_fastnoise)
+            resolution: Heightmap size in pixels
+
+        Returns:
+            float32 array (resolution, resolution) of raw noise values,
+            identical to gen_from_coords() on the full grid
+        """
+        heightmap = np.empty((resolution, resolution), dtype=np.float32)
+        band_rows = min(self._BAND_ROWS, resolution)
+        axis = np.arange(resolution, dtype=np.float32)
+
+        coords = np.empty((2, band_rows * resolution), dtype=np.float32)
+        band = coords.reshape(2, band_rows, resolution)
+        band[0] = axis[np.newaxis, :]
+
+        for y0 in range(0, resolution, band_rows):
+            rows = min(band_rows, resolution - y0)
+            if rows != band_rows:
+                # Last partial band: gen_from_coords needs a contiguous (2, N) array
+                coords = np.ascontiguousarray(coords[:, :rows * resolution])
+                band = coords.reshape(2, rows, resolution)
+            band[1] = axis[y0:y0 + rows, np.newaxis]
+            heightmap[y0:y0 + rows] = noise.gen_from_coords(coords).reshape(rows, resolution)
+
+        return heightmap
+
+    def _get_coordinate_grid(self, resolution: int) -> np.ndarray:
+        """
+        Return the cached float32 sample-coordinate grid for a resolution.
+
+        The grid is laid out exactly as FastNoiseLite.gen_from_coords() expects,
+        so it can be passed straight through without a np.stack() copy. The
+        per-axis 2D views are available via coords.reshape(2, resolution, resolution).
+
+        Args:
+            resolution: Heightmap size in pixels
+
+        Returns:
+            float32 array of shape (2, resolution * resolution) where row 0 holds
+            x coordinates and row 1 holds y coordinates (row-major pixel order)
+
+        WARNING: The array is shared between calls - never modify it in place.
+        (It is not flagged read-only because gen_from_coords rejects read-only buffers.)
+        """
+        coords = self._coordinate_grids.get(resolution)
+        if coords is None:
+            axis = np.arange(resolution, dtype=np.float32)
+            coords = np.empty((2, resolution * resolution), dtype=np.float32)
+            grid = coords.reshape(2, resolution, resolution)
+            grid[0] = axis[np.newaxis, :]
+            grid[1] = axis[:, np.newaxis]
+            self._coordinate_grids[resolution] = coords
+        return coords
+
     def generate_perlin(self,
                        resolution: int = 4096,
                        scale: float = 100.0,
@@ -104,11 +406,21 @@ class NoiseGenerator:
         - Pure Python fallback: Guaranteed to work on all systems
         - Domain warping adds minimal overhead (~0.5-1.0s at 4096x4096)
         - Recursive warping adds ~1-2s overhead for dramatic quality improvement
+        - With cache_perlin=True, repeated calls with identical parameters (and
+          seed) return a copy of the previous result instead of regenerating it
 
         Stage 1 Quick Win 1 - Recursive Domain Warping:
         Use recursive_warp=True with domain_warp_amp=60.0 for maximum realism.
         This combination eliminates ALL grid artifacts and creates geological authenticity.
         """
+        cache_key = None
+        if self.cache_perlin:
+            # WHY self.seed in the key: it is a public attribute and may be reassigned
+            cache_key = (self.seed, resolution, scale, octaves, persistence, lacunarity,
+                         domain_warp_amp, domain_warp_type, recursive_warp, recursive_warp_strength)
+            if self._perlin_cache is not None and self._perlin_cache[0] == cache_key:
+                return self._perlin_cache[1].copy()
+
         # Try fast path first
         if FASTNOISE_AVAILABLE:
             print(f"[DEBUG] Using FAST vectorized path (FASTNOISE_AVAILABLE=True)")
@@ -116,10 +428,13 @@ class NoiseGenerator:
                 print(f"[PHASE1] Domain warping ENABLED (strength={domain_warp_amp:.1f})")
             if recursive_warp:
                 print(f"[STAGE1] Recursive warping ENABLED (strength={recursive_warp_strength:.1f})")
-            return self._generate_perlin_fast(resolution, scale, octaves,
-                                             persistence, lacunarity, show_progress,
-                                             domain_warp_amp, domain_warp_type,
-                                             recursive_warp, recursive_warp_strength)
+            heightmap = self._generate_perlin_fast(resolution, scale, octaves,
+                                                  persistence, lacunarity, show_progress,
+                                                  domain_warp_amp, domain_warp_type,
+                                                  recursive_warp, recursive_warp_strength)
+            if cache_key is not None:
+                self._perlin_cache = (cache_key, heightmap.copy())
+            return heightmap
 
         # Fallback to pure Python
         print(f"[DEBUG] Using SLOW fallback path (FASTNOISE_AVAILABLE=False)")
@@ -152,6 +467,8 @@ class NoiseGenerator:
         # Normalize to 0.0-1.0
         heightmap = (heightmap - heightmap.min()) / (heightmap.max() - heightmap.min())
 
+        if cache_key is not None:
+            self._perlin_cache = (cache_key, heightmap.copy())
         return heightmap
 
     def _generate_perlin_fast(self,
@@ -209,18 +526,36 @@ class NoiseGenerator:
           creating compound curves that match tectonic plate interactions.
           Research: Quilez (2008), Perlin (1985)
         """
-        # Initialize FastNoiseLite
-        noise = FastNoiseLite(seed=self.seed)
+        if show_progress:
+            print("Generating terrain (FastNoise - vectorized)...")
 
-        # Configure noise type (Perlin for consistency)
-        noise.noise_type = NoiseType.NoiseType_Perlin
+        # Apply recursive domain warping if enabled (Stage 1 Quick Win 1)
+        # WHY: Inigo Quilez's recursive technique creates compound distortions
+        # that authentically mimic tectonic processes. This is the difference
+        # between "terrain with curves" and "geological authenticity."
+        coords = None
+        if recursive_warp:
+            if show_progress:
+                print(f"[STAGE1] Applying recursive domain warping (strength={recursive_warp_strength:.1f})...")
+            # Full coordinate grid (cached per resolution, built once)
+            xx, yy = self._get_coordinate_grid(resolution).reshape(2, resolution, resolution)
+            xx, yy = self._apply_recursive_domain_warp(
+                xx, yy, resolution, scale,
+                recursive_warp_strength, octaves, persistence
+            )
 
-        # Configure fractal (FBM = Fractal Brownian Motion)
-        noise.fractal_type = FractalType.FractalType_FBm
-        noise.fractal_octaves = octaves
-        noise.fractal_gain = persistence  # Amplitude multiplier per octave
-        noise.fractal_lacunarity = lacunarity
-        noise.frequency = 1.0 / scale  # FastNoiseLite uses frequency instead of scale
+            # Stack warped coordinates in format (2, num_points) for gen_from_coords
+            # CRITICAL: Convert to float32 for FastNoiseLite compatibility
+            # WHY: Recursive warping creates float64, but FastNoiseLite expects float32
+            coords = np.stack([xx.ravel(), yy.ravel()], axis=0).astype(np.float32)
+
+        # Configure FastNoiseLite: Perlin (for consistency) with FBM fractal
+        # (Fractal Brownian Motion). FastNoiseLite uses frequency instead of scale.
+        # NOTE: Configured after recursive warping, which reuses the shared object.
+        noise = self._configure_fastnoise(
+            self.seed, NoiseType.NoiseType_Perlin,
+            octaves, persistence, lacunarity, 1.0 / scale
+        )
 
         # Configure domain warping (Phase 1.1)
         # WHY: Domain warping eliminates grid-aligned patterns by warping
@@ -242,40 +577,13 @@ class NoiseGenerator:
             else:
                 noise.domain_warp_type = domain_warp_type
 
-        if show_progress:
-            print("Generating terrain (FastNoise - vectorized)...")
-
         # VECTORIZED GENERATION - KEY OPTIMIZATION
-        # Create coordinate grids for entire heightmap
-        # This replaces 16.7M function calls with a single vectorized operation
-        x_coords = np.arange(resolution, dtype=np.float32)
-        y_coords = np.arange(resolution, dtype=np.float32)
-        xx, yy = np.meshgrid(x_coords, y_coords)
-
-        # Apply recursive domain warping if enabled (Stage 1 Quick Win 1)
-        # WHY: Inigo Quilez's recursive technique creates compound distortions
-        # that authentically mimic tectonic processes. This is the difference
-        # between "terrain with curves" and "geological authenticity."
-        if recursive_warp:
-            if show_progress:
-                print(f"[STAGE1] Applying recursive domain warping (strength={recursive_warp_strength:.1f})...")
-            xx, yy = self._apply_recursive_domain_warp(
-                xx, yy, resolution, scale,
-                recursive_warp_strength, octaves, persistence
-            )
-
-        # Stack coordinates in format (2, num_points) as required by gen_from_coords
-        # Ravel() flattens the 2D grids into 1D arrays for batch processing
-        # CRITICAL: Convert to float32 for FastNoiseLite compatibility
-        # WHY: Recursive warping creates float64, but FastNoiseLite expects float32
-        coords = np.stack([xx.ravel(), yy.ravel()], axis=0).astype(np.float32)
-
-        # Generate all noise values in one vectorized call
-        # This is where the magic happens - C++/Cython handles all 16.7M points at once
-        noise_values = noise.gen_from_coords(coords)
-
-        # Reshape back to 2D heightmap
-        heightmap = noise_values.reshape(resolution, resolution)
+        # C++/Cython evaluates all 16.7M points in bulk instead of 16.7M
+        # Python calls (unwarped: streamed in row bands, see _generate_noise_grid)
+        if coords is not None:
+            heightmap = noise.gen_from_coords(coords).reshape(resolution, resolution)
+        else:
+            heightmap = self._generate_noise_grid(noise, resolution)
 
         # Normalize to 0.0-1.0 (FastNoiseLite returns approximately -1 to 1)
         heightmap = (heightmap - heightmap.min()) / (heightmap.max() - heightmap.min())
@@ -322,23 +630,27 @@ class NoiseGenerator:
         Performance: Adds ~1-2s overhead at 4096x4096 for dramatic quality improvement
         """
         # Initialize noise generator for warping (different seed for independence)
-        warp_noise = FastNoiseLite(seed=self.seed + 9999)
-        warp_noise.noise_type = NoiseType.NoiseType_OpenSimplex2
-        warp_noise.fractal_type = FractalType.FractalType_FBm
-        warp_noise.fractal_octaves = max(3, octaves // 2)  # Fewer octaves for warping
-        warp_noise.fractal_gain = persistence
-        warp_noise.fractal_lacunarity = 2.0
-        warp_noise.frequency = 1.0 / (scale * 1.5)  # Slightly larger scale for warping
+        # Fewer octaves and a slightly larger scale than the terrain pass
+        warp_noise = self._configure_fastnoise(
+            self.seed + 9999, NoiseType.NoiseType_OpenSimplex2,
+            max(3, octaves // 2), persistence, 2.0, 1.0 / (scale * 1.5)
+        )
+
+        # Both samples of each stage go through ONE gen_from_coords call:
+        # points [0, N) hold the first sample, [N, 2N) the second. The float32
+        # coordinate buffer is written in place and reused for both stages.
+        coords = np.empty((2, 2 * resolution * resolution), dtype=np.float32)
+        grid = coords.reshape(2, 2, resolution, resolution)  # [axis, sample]
 
         # Stage 1: Generate q pattern (primary distortion)
         # q = (fbm(p + offset1), fbm(p + offset2))
         # Offsets are arbitrary but must differ to create variation
-        # CRITICAL: Convert to float32 for FastNoiseLite compatibility
-        coords_q1 = np.stack([(xx + 0.0).ravel(), (yy + 0.0).ravel()], axis=0).astype(np.float32)
-        coords_q2 = np.stack([(xx + 5.2 * scale).ravel(), (yy + 1.3 * scale).ravel()], axis=0).astype(np.float32)
+        grid[0, 0] = xx
+        grid[1, 0] = yy
+        np.add(xx, 5.2 * scale, out=grid[0, 1])
+        np.add(yy, 1.3 * scale, out=grid[1, 1])
 
-        q1 = warp_noise.gen_from_coords(coords_q1).reshape(resolution, resolution)
-        q2 = warp_noise.gen_from_coords(coords_q2).reshape(resolution, resolution)
+        q1, q2 = warp_noise.gen_from_coords(coords).reshape(2, resolution, resolution)
 
         # Normalize q to reasonable range for coordinate offsets
         q1_norm = q1 * scale * 0.5
@@ -346,18 +658,14 @@ class NoiseGenerator:
 
         # Stage 2: Generate r pattern (compound distortion based on q)
         # r = (fbm(p + strength*q + offset3), fbm(p + strength*q + offset4))
-        # CRITICAL: Convert to float32 for FastNoiseLite compatibility
-        coords_r1 = np.stack([
-            (xx + strength * q1_norm + 1.7 * scale).ravel(),
-            (yy + strength * q2_norm + 9.2 * scale).ravel()
-        ], axis=0).astype(np.float32)
-        coords_r2 = np.stack([
-            (xx + strength * q1_norm + 8.3 * scale).ravel(),
-            (yy + strength * q2_norm + 2.8 * scale).ravel()
-        ], axis=0).astype(np.float32)
-
-        r1 = warp_noise.gen_from_coords(coords_r1).reshape(resolution, resolution)
-        r2 = warp_noise.gen_from_coords(coords_r2).reshape(resolution, resolution)
+        qx = xx + strength * q1_norm
+        qy = yy + strength * q2_norm
+        np.add(qx, 1.7 * scale, out=grid[0, 0])
+        np.add(qy, 9.2 * scale, out=grid[1, 0])
+        np.add(qx, 8.3 * scale, out=grid[0, 1])
+        np.add(qy, 2.8 * scale, out=grid[1, 1])
+
+        r1, r2 = warp_noise.gen_from_coords(coords).reshape(2, resolution, resolution)
 
         # Normalize r to reasonable range
         r1_norm = r1 * scale * 0.5
@@ -416,6 +724,13 @@ class NoiseGenerator:
         - Fast: ~0.5-1.0s at 4096x4096 (uses FastNoiseLite if available)
         - Deterministic with seed (reproducible results)
 
+        NOTE: There is deliberately no per-octave layer output (summing fewer
+        octaves under this mask instead of low-passing the terrain). Switching
+        octave counts at the mask edge is the frequency-discontinuity failure
+        described in BuildabilityEnforcer.generate_buildability_mask_from_tectonics;
+        the tectonic pipeline keeps the same octaves everywhere and modulates
+        amplitude only.
+
         Reference: docs/analysis/map_gen_enhancement.md Priority 2, Task 2.2
         """
         # Use provided seed or generate new one
@@ -428,22 +743,13 @@ class NoiseGenerator:
         # WHY: Large scale (low frequency) creates geological-scale regions
         # Low octaves (2) prevents fine detail - we want broad zones
         if FASTNOISE_AVAILABLE:
-            noise = FastNoiseLite(seed=seed)
-            noise.noise_type = NoiseType.NoiseType_Perlin
-            noise.fractal_type = FractalType.FractalType_FBm
-            noise.fractal_octaves = 2  # Low octaves = broad features
-            noise.fractal_gain = 0.5
-            noise.fractal_lacunarity = 2.0
-            noise.frequency = 0.001  # Very low frequency = very large scale
-
-            # Vectorized generation
-            x_coords = np.arange(resolution, dtype=np.float32)
-            y_coords = np.arange(resolution, dtype=np.float32)
-            xx, yy = np.meshgrid(x_coords, y_coords)
-            coords = np.stack([xx.ravel(), yy.ravel()], axis=0).astype(np.float32)
+            # 2 octaves = broad features, very low frequency = very large scale
+            noise = self._configure_fastnoise(
+                seed, NoiseType.NoiseType_Perlin, 2, 0.5, 2.0, 0.001
+            )
 
-            noise_values = noise.gen_from_coords(coords)
-            control_map = noise_values.reshape(resolution, resolution)
+            # Vectorized generation (streamed in row bands)
+            control_map = self._generate_noise_grid(noise, resolution)
         else:
             # Fallback to pure Python (slower but works everywhere)
             print("[STAGE2] Using slow fallback for control map generation")
@@ -457,51 +763,44 @@ class NoiseGenerator:
                     ny = y / scale
                     control_map[y, x] = perlin([nx, ny])
 
-        # Normalize to [0, 1]
-        control_map = (control_map - control_map.min()) / (control_map.max() - control_map.min())
+        # Normalize to [0, 1] in place (the FastNoiseLite path is float32, so
+        # normalize/percentile/threshold all run on half the bytes of float64)
+        control_min = control_map.min()
+        control_map -= control_min
+        control_map /= control_map.max()
 
         # Threshold to achieve target percentage
         # WHY: We want exactly target_percent of terrain to be buildable
         # Find threshold value that splits the map at target percentage
-        threshold = np.percentile(control_map, 100 - target_percent)
-        control_map_binary = (control_map >= threshold).astype(np.float64)
+        threshold = _percentile_threshold(control_map, 100 - target_percent)
+        # Kept as bool through the morphology (1 byte/pixel instead of 8);
+        # converted to float64 once on return. Area reports use count_nonzero,
+        # which counts the bytes directly instead of summing in float64 like
+        # np.mean does.
+        # NOTE: Thresholding straight into the float64 result
+        # (np.greater_equal(..., out=float64, casting='unsafe')) was measured
+        # at 35ms vs 37ms for compare + astype at 4096x4096 - not worth a
+        # separate radius-0 path, the float64 write dominates either way.
+        control_map_binary = control_map >= threshold
 
         print(f"[STAGE2] Binary threshold: {threshold:.3f}, " +
-              f"buildable area: {np.mean(control_map_binary) * 100:.1f}%")
+              f"buildable area: {np.count_nonzero(control_map_binary) / control_map_binary.size * 100:.1f}%")
 
         # Apply morphological operations for consolidated regions
         # WHY: Removes scattered pixels, creates contiguous buildable zones
         # Dilation expands regions, erosion shrinks them - net effect is smoothing
         if smoothing_radius > 0:
-            try:
-                from scipy import ndimage
-
-                # Create circular structure element
-                y_struct, x_struct = np.ogrid[-smoothing_radius:smoothing_radius+1,
-                                               -smoothing_radius:smoothing_radius+1]
-                structure = x_struct**2 + y_struct**2 <= smoothing_radius**2
-
-                # Dilate then erode (closing operation - fills small holes)
-                control_map_smooth = ndimage.binary_dilation(control_map_binary, structure=structure)
-                control_map_smooth = ndimage.binary_erosion(control_map_smooth, structure=structure)
-                control_map_smooth = control_map_smooth.astype(np.float64)
-
-                actual_percent = np.mean(control_map_smooth) * 100
-                print(f"[STAGE2] After smoothing: buildable area = {actual_percent:.1f}%")
-
-                # CRITICAL: Convert to BINARY (0 or 1) to prevent blending contamination
-                # WHY: Gradient values (0.7) blend steep scenic into buildable zones!
-                # Binary ensures buildable zones stay 100% pure smooth terrain
-                control_map_binary = (control_map_smooth >= 0.5).astype(np.float64)
-                binary_percent = np.mean(control_map_binary) * 100
-                print(f"[STAGE2] After binarization: buildable area = {binary_percent:.1f}%")
+            # Dilate then erode with a circular structure element
+            # (closing operation - fills small holes)
+            control_map_binary = _close_with_disk(control_map_binary, int(smoothing_radius))
 
-                return control_map_binary
-            except ImportError:
-                print("[STAGE2] WARNING: scipy not available, skipping morphological smoothing")
-                return control_map_binary
+            # CRITICAL: Result stays BINARY (0 or 1) to prevent blending contamination
+            # WHY: Gradient values (0.7) blend steep scenic into buildable zones!
+            # Binary ensures buildable zones stay 100% pure smooth terrain
+            actual_percent = np.count_nonzero(control_map_binary) / control_map_binary.size * 100
+            print(f"[STAGE2] After smoothing: buildable area = {actual_percent:.1f}%")
 
-        return control_map_binary
+        return control_map_binary.astype(np.float64)
 
     def generate_simplex(self,
                         resolution: int = 4096,
@@ -581,35 +880,19 @@ class NoiseGenerator:
 
         Performance improvement: 10-100x faster than pure Python loops.
         """
-        # Initialize FastNoiseLite
-        noise = FastNoiseLite(seed=self.seed)
-
-        # Configure noise type (OpenSimplex2 is faster and cleaner than Perlin)
-        noise.noise_type = NoiseType.NoiseType_OpenSimplex2
-
-        # Configure fractal (FBM = Fractal Brownian Motion)
-        noise.fractal_type = FractalType.FractalType_FBm
-        noise.fractal_octaves = octaves
-        noise.fractal_gain = persistence
-        noise.fractal_lacunarity = lacunarity
-        noise.frequency = 1.0 / scale
+        # Configure FastNoiseLite: OpenSimplex2 (faster and cleaner than Perlin)
+        # with FBM fractal (Fractal Brownian Motion)
+        noise = self._configure_fastnoise(
+            self.seed, NoiseType.NoiseType_OpenSimplex2,
+            octaves, persistence, lacunarity, 1.0 / scale
+        )
 
         if show_progress:
             print("Generating terrain (OpenSimplex2 - vectorized)...")
 
         # VECTORIZED GENERATION - same optimization as Perlin
-        x_coords = np.arange(resolution, dtype=np.float32)
-        y_coords = np.arange(resolution, dtype=np.float32)
-        xx, yy = np.meshgrid(x_coords, y_coords)
-
-        # Stack coordinates for batch processing
-        coords = np.stack([xx.ravel(), yy.ravel()], axis=0)
-
-        # Generate all noise values in one call
-        noise_values = noise.gen_from_coords(coords)
-
-        # Reshape to 2D heightmap
-        heightmap = noise_values.reshape(resolution, resolution)
+        # (bulk evaluation, streamed in row bands)
+        heightmap = self._generate_noise_grid(noise, resolution)
 
         # Normalize to 0.0-1.0
         heightmap = (heightmap - heightmap.min()) / (heightmap.max() - heightmap.min())
@@ -17,8 +17,8 @@ because it's the mathematically optimal solution to the undo/redo problem.
 
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Optional, List, Any
-from copy import deepcopy
+from collections import deque
+from typing import Optional, List, Any, Deque
 
 
 class Command(ABC):
@@ -42,6 +42,35 @@ class Command(ABC):
         """
         self.description = description
         self._executed = False
+        # Set by MacroCommand when it snapshots the heightmap once for all of
+        # its children - the command then stores no undo state of its own
+        self._skip_snapshot = False
+        # Recycled snapshot buffers, set by CommandHistory.execute (see _snapshot)
+        self._snapshot_pool = None
+
+    def _snapshot(self, heightmap: np.ndarray) -> np.ndarray:
+        """
+        Copy the heightmap for undo, reusing a pooled buffer when one fits.
+
+        WHY: Full snapshots are 128MB at 4096x4096. Once the history is full,
+        every new command evicts an old one - CommandHistory hands the evicted
+        snapshot back through the pool so it can be overwritten instead of
+        allocating (and page-faulting) a fresh array.
+
+        Args:
+            heightmap: Array to snapshot (not modified)
+
+        Returns:
+            Private copy of heightmap
+        """
+        pool = self._snapshot_pool
+        if pool:
+            for i, buffer in enumerate(pool):
+                if buffer.shape == heightmap.shape and buffer.dtype == heightmap.dtype:
+                    del pool[i]
+                    np.copyto(buffer, heightmap)
+                    return buffer
+        return heightmap.copy()
 
     @abstractmethod
     def execute(self) -> None:
@@ -96,7 +125,7 @@ class SetHeightDataCommand(Command):
     def execute(self) -> None:
         """Store current state and apply new data."""
         # Save current heightmap for undo
-        self.old_data = self.generator.get_height_data()
+        self.old_data = None if self._skip_snapshot else self._snapshot(self.generator.heightmap)
 
         # Apply new data
         if self.normalize:
@@ -134,7 +163,7 @@ class SmoothCommand(Command):
 
     def execute(self) -> None:
         """Store state and apply smoothing."""
-        self.old_data = self.generator.get_height_data()
+        self.old_data = None if self._skip_snapshot else self._snapshot(self.generator.heightmap)
         self.generator.smooth(self.iterations, self.kernel_size)
         self._executed = True
 
@@ -151,7 +180,8 @@ class AddCircleCommand(Command):
     """
     Command for adding circular hills/depressions.
 
-    Memory optimization: Only stores the affected circular region.
+    Memory optimization: Only stores the circle's bounding box, not the
+    entire heightmap (a few KB instead of 128MB for a small brush at 4096x4096).
     """
 
     def __init__(self, generator, center_x: float, center_y: float,
@@ -163,13 +193,49 @@ class AddCircleCommand(Command):
         self.radius = radius
         self.height = height
         self.blend = blend
-        self.old_data = None
+        self.old_data = None   # Full snapshot (fallback only)
+        self.old_patch = None  # Bounding-box snapshot (normal case)
+        self._bbox = None      # (y0, y1, x0, x1) of old_patch
+
+    def _circle_bbox(self) -> tuple:
+        """
+        Pixel bounding box of the region add_circle() can modify.
+
+        Mirrors the integer conversion in HeightmapGenerator.add_circle():
+        only pixels within distance r of (cx, cy) receive a non-zero mask.
+
+        Returns:
+            (y0, y1, x0, x1) slice bounds, clamped to the heightmap
+        """
+        resolution = self.generator.resolution
+        cx = int(self.center_x * resolution)
+        cy = int(self.center_y * resolution)
+        r = int(self.radius * resolution)
+
+        x0, x1 = max(cx - r, 0), min(cx + r + 1, resolution)
+        y0, y1 = max(cy - r, 0), min(cy + r + 1, resolution)
+        return y0, max(y1, y0), x0, max(x1, x0)
 
     def execute(self) -> None:
-        """Store state and add circle."""
-        # For simplicity, store entire heightmap
-        # TODO: Optimize to store only circular region
-        self.old_data = self.generator.get_height_data()
+        """Store affected region and add circle."""
+        heightmap = self.generator.heightmap
+
+        # add_circle() clips the WHOLE map to [0, 1]. When the map is already in
+        # range that clip changes nothing outside the circle, so the bounding box
+        # is all we need to restore. Otherwise fall back to a full snapshot.
+        if self._skip_snapshot:
+            self._bbox = None
+            self.old_patch = None
+            self.old_data = None
+        elif heightmap.min() >= 0.0 and heightmap.max() <= 1.0:
+            self._bbox = self._circle_bbox()
+            y0, y1, x0, x1 = self._bbox
+            self.old_patch = heightmap[y0:y1, x0:x1].copy()
+            self.old_data = None
+        else:
+            self._bbox = None
+            self.old_patch = None
+            self.old_data = self._snapshot(self.generator.heightmap)
 
         self.generator.add_circle(
             self.center_x, self.center_y,
@@ -179,10 +245,16 @@ class AddCircleCommand(Command):
 
     def undo(self) -> None:
         """Restore pre-circle state."""
-        if not self._executed or self.old_data is None:
+        if not self._executed:
             return
 
-        self.generator.heightmap = self.old_data
+        if self.old_patch is not None:
+            y0, y1, x0, x1 = self._bbox
+            self.generator.heightmap[y0:y1, x0:x1] = self.old_patch
+        elif self.old_data is not None:
+            self.generator.heightmap = self.old_data
+        else:
+            return
         self._executed = False
 
 
@@ -202,7 +274,7 @@ class ApplyFunctionCommand(Command):
 
     def execute(self) -> None:
         """Store state and apply function."""
-        self.old_data = self.generator.get_height_data()
+        self.old_data = None if self._skip_snapshot else self._snapshot(self.generator.heightmap)
         self.generator.apply_function(self.func)
         self._executed = True
 
@@ -218,6 +290,11 @@ class ApplyFunctionCommand(Command):
 class NormalizeCommand(Command):
     """
     Command for normalizing height range.
+
+    Memory optimization: normalize_range() is an affine map, so undo only
+    needs the previous (min, max) to invert it (restored to within float
+    rounding). A full snapshot is kept only when the target range is empty,
+    since that collapses all detail to a single value.
     """
 
     def __init__(self, generator, min_height: float = 0.0, max_height: float = 1.0):
@@ -225,20 +302,46 @@ class NormalizeCommand(Command):
         self.generator = generator
         self.min_height = min_height
         self.max_height = max_height
-        self.old_data = None
+        self.old_data = None  # Full snapshot (non-invertible case only)
+        self.old_min = None
+        self.old_max = None
 
     def execute(self) -> None:
-        """Store state and normalize."""
-        self.old_data = self.generator.get_height_data()
+        """Store previous range and normalize."""
+        if self._skip_snapshot:
+            self.old_min = self.old_max = self.old_data = None
+            self.generator.normalize_range(self.min_height, self.max_height)
+            self._executed = True
+            return
+
+        self.old_min = float(np.min(self.generator.heightmap))
+        self.old_max = float(np.max(self.generator.heightmap))
+
+        invertible = (
+            np.isfinite(self.old_min) and np.isfinite(self.old_max) and
+            (self.max_height != self.min_height or self.old_max == self.old_min)
+        )
+        self.old_data = None if invertible else self._snapshot(self.generator.heightmap)
+
         self.generator.normalize_range(self.min_height, self.max_height)
         self._executed = True
 
     def undo(self) -> None:
         """Restore pre-normalize state."""
-        if not self._executed or self.old_data is None:
+        if not self._executed or self.old_min is None:
             return
 
-        self.generator.heightmap = self.old_data
+        if self.old_data is not None:
+            self.generator.heightmap = self.old_data
+        elif self.old_max == self.old_min:
+            # Flat map: normalize_range() filled it with min_height
+            self.generator.heightmap.fill(self.old_min)
+        else:
+            # Invert: normalized * (max - min) + min
+            scale = (self.old_max - self.old_min) / (self.max_height - self.min_height)
+            self.generator.heightmap = (
+                (self.generator.heightmap - self.min_height) * scale + self.old_min
+            )
         self._executed = False
 
 
@@ -249,25 +352,46 @@ class MacroCommand(Command):
     Example: "Generate Island Map" = Generate Perlin + Add Radial Gradient + Smooth
 
     This allows complex operations to be undone/redone as a single unit.
+
+    Memory optimization: When every sub-command edits the same generator, the
+    macro takes ONE snapshot before running them and the sub-commands store
+    no undo state of their own (1 heightmap copy instead of up to N).
     """
 
     def __init__(self, commands: List[Command], description: str):
         super().__init__(description)
         self.commands = commands
+        self.old_data = None  # Single snapshot shared by all sub-commands
+
+    def _shared_generator(self):
+        """Generator edited by every sub-command, or None if there isn't one."""
+        generators = {id(getattr(cmd, 'generator', None)) for cmd in self.commands}
+        if len(generators) != 1 or not self.commands:
+            return None
+        return getattr(self.commands[0], 'generator', None)
 
     def execute(self) -> None:
         """Execute all sub-commands in order."""
+        generator = self._shared_generator()
+        self.old_data = None if generator is None else self._snapshot(generator.heightmap)
+
         for cmd in self.commands:
+            cmd._skip_snapshot = self.old_data is not None
             cmd.execute()
         self._executed = True
 
     def undo(self) -> None:
-        """Undo all sub-commands in reverse order."""
+        """Undo all sub-commands (restore the single snapshot if one was taken)."""
         if not self._executed:
             return
 
-        for cmd in reversed(self.commands):
-            cmd.undo()
+        if self.old_data is not None:
+            self.commands[0].generator.heightmap = self.old_data
+            for cmd in self.commands:
+                cmd._executed = False
+        else:
+            for cmd in reversed(self.commands):
+                cmd.undo()
         self._executed = False
 
 
@@ -281,8 +405,16 @@ class CommandHistory:
 
     When a new command is executed, the redo_stack is cleared (you can't
     redo after making a new change - this is standard behavior in all applications).
+
+    Both stacks are deques: undo_stack is bounded by max_history, so the
+    oldest command is evicted in O(1) instead of list.pop(0)'s O(n) shift.
+    The evicted command's full snapshot is recycled for the next command
+    (see Command._snapshot).
     """
 
+    # Spare snapshot buffers kept for reuse (steady state needs only one)
+    SNAPSHOT_POOL_SIZE = 2
+
     def __init__(self, max_history: int = 50):
         """
         Initialize command history.
@@ -291,9 +423,23 @@ class CommandHistory:
             max_history: Maximum number of commands to keep in history.
                         Older commands are automatically purged to save memory.
         """
-        self.undo_stack: List[Command] = []
-        self.redo_stack: List[Command] = []
+        self.undo_stack: Deque[Command] = deque(maxlen=max_history)
+        self.redo_stack: Deque[Command] = deque()
         self.max_history = max_history
+        self._snapshot_pool: List[np.ndarray] = []
+
+    def _recycle_snapshot(self, command: Command) -> None:
+        """
+        Return an evicted command's full snapshot to the buffer pool.
+
+        Only executed commands qualify: after undo, old_data has been assigned
+        back to the generator and is the live heightmap.
+        """
+        old_data = getattr(command, 'old_data', None)
+        if (command._executed and isinstance(old_data, np.ndarray)
+                and len(self._snapshot_pool) < self.SNAPSHOT_POOL_SIZE):
+            self._snapshot_pool.append(old_data)
+            command.old_data = None
 
     def execute(self, command: Command) -> None:
         """
@@ -302,18 +448,23 @@ class CommandHistory:
         Args:
             command: Command to execute
         """
+        # Command about to fall off the bounded undo stack (if any)
+        evicted = None
+        if self.max_history and len(self.undo_stack) == self.undo_stack.maxlen:
+            evicted = self.undo_stack[0]
+
         # Execute the command
+        command._snapshot_pool = self._snapshot_pool
         command.execute()
 
-        # Add to undo stack
+        # Add to undo stack (bounded deque drops the oldest command)
         self.undo_stack.append(command)
 
         # Clear redo stack (can't redo after new action)
         self.redo_stack.clear()
 
-        # Limit history size
-        if len(self.undo_stack) > self.max_history:
-            self.undo_stack.pop(0)  # Remove oldest command
+        if evicted is not None:
+            self._recycle_snapshot(evicted)
 
     def undo(self) -> Optional[str]:
         """
@@ -369,6 +520,7 @@ class CommandHistory:
         """Clear all history (useful when loading a new heightmap)."""
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self._snapshot_pool.clear()
 
     def get_undo_list(self) -> List[str]:
         """
@@ -395,15 +547,16 @@ class CommandHistory:
         Returns:
             Dictionary with memory usage statistics
         """
-        undo_arrays = sum(
-            cmd.old_data.nbytes if hasattr(cmd, 'old_data') and cmd.old_data is not None else 0
-            for cmd in self.undo_stack
-        )
-
-        redo_arrays = sum(
-            cmd.old_data.nbytes if hasattr(cmd, 'old_data') and cmd.old_data is not None else 0
-            for cmd in self.redo_stack
-        )
+        def undo_state_nbytes(cmd: Command) -> int:
+            # Full snapshots (old_data) and partial region snapshots (old_patch)
+            return sum(
+                getattr(cmd, attr).nbytes
+                for attr in ('old_data', 'old_patch')
+                if getattr(cmd, attr, None) is not None
+            )
+
+        undo_arrays = sum(undo_state_nbytes(cmd) for cmd in self.undo_stack)
+        redo_arrays = sum(undo_state_nbytes(cmd) for cmd in self.redo_stack)
 
         return {
             'undo_commands': len(self.undo_stack),
@@ -16,10 +16,43 @@ Created: 2025-10-07
 Author: CS2 Map Generator Project
 """
 
+import math
 from typing import List, Tuple, Optional, Dict
 import numpy as np
-from scipy.interpolate import splprep, splev
-from scipy.ndimage import distance_transform_edt
+from scipy.interpolate import BSpline, splprep
+from scipy.ndimage import distance_transform_edt, zoom
+
+# Optional: multi-threaded exact EDT with native pixel spacing (float32 output)
+# Graceful fallback to scipy's single-threaded transform if unavailable
+try:
+    import edt
+    EDT_AVAILABLE = True
+except ImportError:
+    EDT_AVAILABLE = False
+
+# Optional: OpenCV bilinear resize (SIMD) for the fast uplift upsample
+# Graceful fallback to scipy's zoom (same values to float32 rounding)
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+def _upsample_2x(data: np.ndarray) -> np.ndarray:
+    """
+    Bilinearly upsample a 2D array to twice its size (pixel-center aligned).
+
+    Args:
+        data: 2D float array
+
+    Returns:
+        Array of shape (2 * rows, 2 * cols), same dtype
+    """
+    rows, cols = data.shape
+    if CV2_AVAILABLE:
+        return cv2.resize(data, (2 * cols, 2 * rows), interpolation=cv2.INTER_LINEAR)
+    return zoom(data, 2, order=1, grid_mode=True, mode='nearest')
 
 
 class TectonicStructureGenerator:
@@ -75,6 +108,11 @@ class TectonicStructureGenerator:
         self.edge_margin_pixels = int(edge_margin_meters / self.meters_per_pixel)
         self.min_fault_spacing_pixels = int(min_fault_spacing_meters / self.meters_per_pixel)
 
+        # Last (fault parameters, distance field) from generate_tectonic_terrain
+        # WHY: Tuning max_uplift/falloff_meters reuses the same faults, and the
+        # distance transform is the expensive step
+        self._distance_cache = None
+
     def generate_fault_lines(
         self,
         num_faults: int,
@@ -114,7 +152,9 @@ class TectonicStructureGenerator:
 
         # Track fault starting positions to enforce minimum spacing
         # WHY: Prevents unrealistic clustering of parallel faults
-        fault_start_positions = []
+        # WHY array: each candidate is checked against all accepted starts at once
+        fault_starts_x = np.empty(num_faults)
+        fault_starts_y = np.empty(num_faults)
 
         # Determine fault characteristics based on terrain type
         # WHY: Different terrain types result from different tectonic regimes
@@ -130,11 +170,14 @@ class TectonicStructureGenerator:
 
         # Calculate map diagonal for length scaling
         # WHY: Faults should scale with map size, not be fixed length
-        map_diagonal = np.sqrt(2 * self.resolution**2)
+        # WHY math (here and for the per-fault scalars): no 0-d array dispatch
+        map_diagonal = math.sqrt(2 * self.resolution**2)
 
         attempts = 0
         max_attempts = num_faults * 10  # Prevent infinite loops
 
+        # WHY sequential: the RNG draws (and so each seed's faults) depend on
+        # which earlier attempts were rejected
         while len(fault_lines) < num_faults and attempts < max_attempts:
             attempts += 1
 
@@ -157,12 +200,15 @@ class TectonicStructureGenerator:
 
             # Check minimum spacing from existing faults
             # WHY: Prevents unrealistic clustering of mountain ranges
-            if fault_start_positions:
-                distances = [
-                    np.sqrt((start_x - px)**2 + (start_y - py)**2) * self.meters_per_pixel
-                    for px, py in fault_start_positions
-                ]
-                if min(distances) < self.min_fault_spacing_meters:
+            # WHY sqrt kept: at most num_faults elements, and comparing squared
+            # pixel distances would round the threshold differently
+            num_accepted = len(fault_lines)
+            if num_accepted:
+                distances = np.sqrt(
+                    (start_x - fault_starts_x[:num_accepted])**2 +
+                    (start_y - fault_starts_y[:num_accepted])**2
+                ) * self.meters_per_pixel
+                if distances.min() < self.min_fault_spacing_meters:
                     continue  # Too close to existing fault, try again
 
             # Generate control points for Bezier curve
@@ -184,8 +230,9 @@ class TectonicStructureGenerator:
             if (np.all(fault_x >= 0) and np.all(fault_x < self.resolution) and
                 np.all(fault_y >= 0) and np.all(fault_y < self.resolution)):
 
+                fault_starts_x[len(fault_lines)] = start_x
+                fault_starts_y[len(fault_lines)] = start_y
                 fault_lines.append(np.array([fault_x, fault_y]))
-                fault_start_positions.append((start_x, start_y))
 
         if len(fault_lines) < num_faults:
             # WHY: Warn but continue with what we generated - better than failing
@@ -202,7 +249,7 @@ class TectonicStructureGenerator:
         length_range: Tuple[float, float],
         map_diagonal: float,
         rng: np.random.Generator
-    ) -> List[Tuple[float, float]]:
+    ) -> np.ndarray:
         """
         Generate control points for a Bezier curve fault line.
 
@@ -219,12 +266,15 @@ class TectonicStructureGenerator:
             rng: Random number generator
 
         Returns:
-            List of (x, y) control point tuples
+            Array of shape (num_points, 2) with one (x, y) row per control point
 
         ALGORITHM:
         1. Pick random direction and length
         2. Generate intermediate points along approximate path
         3. Add perpendicular offset for curvature
+
+        Steps 2-3 run as array operations for all intermediate points
+        (~18us per fault), so there is no per-point loop left to JIT.
         """
         # Choose random direction (angle in radians)
         # WHY: Real faults can have any orientation depending on plate motion
@@ -237,53 +287,45 @@ class TectonicStructureGenerator:
 
         # Calculate end point
         # WHY: End point defines overall fault direction and extent
-        end_x = start_x + fault_length * np.cos(direction)
-        end_y = start_y + fault_length * np.sin(direction)
+        end_x = start_x + fault_length * math.cos(direction)
+        end_y = start_y + fault_length * math.sin(direction)
 
         # Clamp end point within bounds with margin
         # WHY: Keep fault endpoints away from map edges
-        end_x = np.clip(
-            end_x,
-            self.edge_margin_pixels,
-            self.resolution - self.edge_margin_pixels
-        )
-        end_y = np.clip(
-            end_y,
-            self.edge_margin_pixels,
-            self.resolution - self.edge_margin_pixels
-        )
+        low = self.edge_margin_pixels
+        high = self.resolution - self.edge_margin_pixels
+        end_x = min(max(end_x, low), high)
+        end_y = min(max(end_y, low), high)
 
-        # Generate intermediate control points
+        # Generate intermediate control points (all at once)
         # WHY: Intermediate points create natural curvature in fault trace
-        control_points = [(start_x, start_y)]
-
-        for i in range(1, num_points - 1):
-            # Linear interpolation along fault direction
-            t = i / (num_points - 1)
-            base_x = start_x + t * (end_x - start_x)
-            base_y = start_y + t * (end_y - start_y)
-
-            # Add perpendicular offset for curvature
-            # WHY: Real faults have gentle curves, not perfectly straight lines
-            perpendicular_angle = direction + np.pi / 2
-            offset_magnitude = rng.uniform(-fault_length * 0.1, fault_length * 0.1)
-
-            offset_x = base_x + offset_magnitude * np.cos(perpendicular_angle)
-            offset_y = base_y + offset_magnitude * np.sin(perpendicular_angle)
-
-            # Clamp to valid range
-            offset_x = np.clip(offset_x, 0, self.resolution - 1)
-            offset_y = np.clip(offset_y, 0, self.resolution - 1)
-
-            control_points.append((offset_x, offset_y))
-
-        control_points.append((end_x, end_y))
+        # Linear interpolation along fault direction
+        t = np.arange(1, num_points - 1) / (num_points - 1)
+        base_x = start_x + t * (end_x - start_x)
+        base_y = start_y + t * (end_y - start_y)
+
+        # Add perpendicular offset for curvature
+        # WHY: Real faults have gentle curves, not perfectly straight lines
+        # WHY size=: draws the same values as one scalar call per point,
+        # so a seed still produces the same faults
+        perpendicular_angle = direction + np.pi / 2
+        offset_magnitude = rng.uniform(-fault_length * 0.1, fault_length * 0.1, size=t.size)
+
+        offset_x = base_x + offset_magnitude * math.cos(perpendicular_angle)
+        offset_y = base_y + offset_magnitude * math.sin(perpendicular_angle)
+
+        # Clamp to valid range
+        control_points = np.empty((num_points, 2))
+        control_points[0] = start_x, start_y
+        control_points[-1] = end_x, end_y
+        np.clip(offset_x, 0, self.resolution - 1, out=control_points[1:-1, 0])
+        np.clip(offset_y, 0, self.resolution - 1, out=control_points[1:-1, 1])
 
         return control_points
 
     def _rasterize_curve(
         self,
-        control_points: List[Tuple[float, float]]
+        control_points: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Convert control points to pixel coordinates using B-spline interpolation.
@@ -294,20 +336,23 @@ class TectonicStructureGenerator:
         stable than high-order Bezier curves.
 
         Args:
-            control_points: List of (x, y) control point tuples
+            control_points: Array of shape (N, 2) from _generate_control_points()
 
         Returns:
             Tuple of (x_pixels, y_pixels) arrays containing rasterized curve
 
         IMPLEMENTATION DETAILS:
-        - Uses scipy.interpolate.splprep for B-spline parameter fitting
+        - Uses scipy.interpolate.splprep for B-spline parameter fitting (~10us;
+          a Bezier would skip the fit but not pass through the middle points)
+        - Evaluates both coordinates in one vectorized BSpline call (same
+          values as splev, ~3x faster than its per-point FITPACK loop)
         - Evaluates at 1000+ points for smooth, continuous curves
         - Handles edge case of too few control points gracefully
         """
         # Separate x and y coordinates
-        # WHY: splprep expects separate coordinate arrays
-        x_coords = np.array([p[0] for p in control_points])
-        y_coords = np.array([p[1] for p in control_points])
+        # WHY: splprep expects separate coordinate arrays (column views, no copy)
+        x_coords = control_points[:, 0]
+        y_coords = control_points[:, 1]
 
         # Handle edge case: need at least 2 points for interpolation
         if len(control_points) < 2:
@@ -323,18 +368,21 @@ class TectonicStructureGenerator:
             # Evaluate spline at many points for smooth curve
             # WHY 1000 points: Ensures smooth rasterization even for long faults
             # More points = smoother curve but same computational cost for distance field
-            num_eval_points = max(1000, int(np.sqrt(
+            num_eval_points = max(1000, int(math.sqrt(
                 (x_coords[-1] - x_coords[0])**2 +
                 (y_coords[-1] - y_coords[0])**2
             ) * 2))
 
             u_fine = np.linspace(0, 1, num_eval_points)
-            curve_points = splev(u_fine, tck)
+            knots, coefficients, k = tck
+            curve_points = BSpline(knots, np.column_stack(coefficients), k)(u_fine)
 
             # Convert to integer pixel coordinates
             # WHY round: Nearest pixel gives best representation
-            x_pixels = np.round(curve_points[0]).astype(int)
-            y_pixels = np.round(curve_points[1]).astype(int)
+            # (bilinear splatting of the float samples would mark every
+            # pixel around the curve, doubling the trace width)
+            x_pixels = np.round(curve_points[:, 0]).astype(int)
+            y_pixels = np.round(curve_points[:, 1]).astype(int)
 
             # Remove duplicate consecutive points
             # WHY: Duplicates waste memory and don't affect distance field
@@ -356,7 +404,7 @@ class TectonicStructureGenerator:
                 x1, y1 = control_points[i]
                 x2, y2 = control_points[i + 1]
 
-                num_points = max(100, int(np.sqrt((x2 - x1)**2 + (y2 - y1)**2)))
+                num_points = max(100, int(math.sqrt((x2 - x1)**2 + (y2 - y1)**2)))
                 t = np.linspace(0, 1, num_points)
 
                 all_x.extend(x1 + t * (x2 - x1))
@@ -390,19 +438,26 @@ class TectonicStructureGenerator:
         # WHY bool dtype: Memory efficient for binary data
         mask = np.zeros((self.resolution, self.resolution), dtype=bool)
 
+        if not fault_lines:
+            return mask
+
         # Mark all fault line pixels
         # WHY: Each fault contributes to the overall tectonic structure
-        for fault in fault_lines:
-            x_pixels, y_pixels = fault[0], fault[1]
-
-            # Bounds check (defensive programming)
-            # WHY: Prevents crashes from edge cases in curve generation
-            valid = (
-                (x_pixels >= 0) & (x_pixels < self.resolution) &
-                (y_pixels >= 0) & (y_pixels < self.resolution)
-            )
+        # WHY traced pixels, not cv2.polylines over sparse samples: coarse
+        # chords would cut across the spline's bends (and this takes <1ms)
+        # WHY concatenated: one bounds check and one indexed write for all
+        # faults instead of one per fault
+        x_pixels, y_pixels = np.concatenate(fault_lines, axis=1)
+
+        # Bounds check (defensive programming)
+        # WHY: Prevents crashes from edge cases in curve generation
+        # WHY filtered, not clipped: clipping would paint the border pixels
+        valid = (
+            (x_pixels >= 0) & (x_pixels < self.resolution) &
+            (y_pixels >= 0) & (y_pixels < self.resolution)
+        )
 
-            mask[y_pixels[valid], x_pixels[valid]] = True
+        mask[y_pixels[valid], x_pixels[valid]] = True
 
         return mask
 
@@ -416,27 +471,43 @@ class TectonicStructureGenerator:
         enabling smooth, continuous elevation profiles.
 
         ALGORITHM:
-        Uses scipy.ndimage.distance_transform_edt (Exact Euclidean Distance Transform)
-        which implements the efficient Saito-Toriwaki algorithm.
+        Exact Euclidean Distance Transform (Saito-Toriwaki). Uses the `edt`
+        package when installed (multi-threaded, pixel spacing applied inside
+        the transform), otherwise scipy.ndimage.distance_transform_edt.
 
         Args:
             fault_mask: Binary mask from create_fault_mask()
 
         Returns:
-            Float array of shape (resolution, resolution) where each value
+            float32 array of shape (resolution, resolution) where each value
             is the distance in METERS to the nearest fault pixel
 
         COMPUTATIONAL COMPLEXITY:
         O(N) where N = number of pixels, regardless of number of faults.
         WHY: Distance transform is inherently efficient for this use case.
         """
+        # WHY invert mask: both transforms measure distance to False (zero) values
+        if EDT_AVAILABLE:
+            # WHY anisotropy: edt scales by pixel size itself - already in meters
+            # WHY not edt.edtsq: exp(-d/falloff) needs the root anyway
+            return edt.edt(
+                ~fault_mask,
+                anisotropy=(self.meters_per_pixel, self.meters_per_pixel),
+                black_border=False,
+                parallel=0
+            )
+
         # Calculate distance in pixels
-        # WHY invert mask: distance_transform_edt measures distance to False values
         distance_pixels = distance_transform_edt(~fault_mask)
 
         # Convert to meters
         # WHY: Physical units make parameters (like falloff distance) intuitive
-        distance_meters = distance_pixels * self.meters_per_pixel
+        # WHY float32: half the memory traffic for the uplift pass, and the
+        # same dtype as the edt path (meter precision is far below 1mm)
+        distance_meters = np.multiply(
+            distance_pixels, self.meters_per_pixel,
+            out=np.empty(distance_pixels.shape, dtype=np.float32)
+        )
 
         return distance_meters
 
@@ -489,11 +560,20 @@ class TectonicStructureGenerator:
         # Apply exponential decay function
         # WHY negative exponent: Creates decay, not growth
         # WHY safe from division by zero: falloff_meters is positive parameter
-        elevation = max_uplift * np.exp(-distance_field / falloff_meters)
+        # WHY in place with NumPy's exp: one output array, and faster than a
+        # Numba kernel or lookup table (see PERFORMANCE.md)
+        elevation = np.divide(distance_field, -falloff_meters)
+        np.exp(elevation, out=elevation)
+        elevation *= max_uplift
 
         # Defensive clipping to normalized range
-        # WHY: Floating point arithmetic can create small over/undershoots
-        elevation = np.clip(elevation, 0.0, 1.0)
+        # WHY conditional: for distances >= 0 and a positive falloff, exp(-d/f)
+        # is in [0, 1], so with 0 <= max_uplift <= 1 the clip cannot change
+        # anything; checking the minimum only reads the input instead of
+        # rewriting the output
+        if not (0.0 <= max_uplift <= 1.0 and falloff_meters > 0
+                and distance_field.min() >= 0):
+            np.clip(elevation, 0.0, 1.0, out=elevation)
 
         return elevation
 
@@ -503,7 +583,8 @@ class TectonicStructureGenerator:
         terrain_type: str = 'mountains',
         max_uplift: float = 0.8,
         falloff_meters: float = 600.0,
-        seed: int = 42
+        seed: int = 42,
+        fast: bool = False
     ) -> np.ndarray:
         """
         Complete pipeline: generate faults and apply uplift profile.
@@ -519,10 +600,20 @@ class TectonicStructureGenerator:
             max_uplift: Peak elevation at faults (0-1)
             falloff_meters: Elevation decay rate
             seed: Random seed for reproducibility
+            fast: Compute distance field and uplift at half resolution and
+                  upsample bilinearly (~2-3x faster for preview/tuning; uplift
+                  error ~0.0005 mean, <0.006 max at ridge crests for 600m falloff)
 
         Returns:
             Normalized elevation array (0-1) ready for blending with other layers
 
+        CACHING:
+        The distance field of the most recent fault set is kept, so calls that
+        only change max_uplift/falloff_meters skip fault generation and the
+        distance transform. The cache holds one full-resolution float32 field
+        (64MB at 4096x4096) for the generator's lifetime; seed=None calls
+        (fresh random faults each time) neither read nor update it.
+
         TYPICAL USAGE:
         ```python
         generator = TectonicStructureGenerator(resolution=4096)
@@ -537,28 +628,59 @@ class TectonicStructureGenerator:
         )
         ```
         """
-        # Step 1: Generate fault line traces
-        # WHY: Defines where mountains will form
-        fault_lines = self.generate_fault_lines(num_faults, terrain_type, seed)
-
-        if not fault_lines:
-            # WHY: Return flat terrain if no faults generated (edge case)
-            print("Warning: No fault lines generated, returning flat terrain")
-            return np.zeros((self.resolution, self.resolution), dtype=np.float32)
-
-        # Step 2: Create binary mask of fault locations
-        # WHY: Required input for distance transform
-        fault_mask = self.create_fault_mask(fault_lines)
+        # WHY even only: half resolution needs whole 2x2 blocks
+        fast = fast and self.resolution % 2 == 0
+
+        # WHY every attribute the faults depend on: they are public and mutable
+        # WHY no cache for seed=None: every call draws fresh faults
+        cache_key = None
+        if seed is not None:
+            cache_key = (
+                num_faults, terrain_type, seed, self.resolution, self.meters_per_pixel,
+                self.edge_margin_pixels, self.min_fault_spacing_meters, fast
+            )
 
-        # Step 3: Calculate distance field
-        # WHY: Needed for elevation falloff calculation
-        distance_field = self.calculate_distance_field(fault_mask)
+        if (cache_key is not None and self._distance_cache is not None
+                and self._distance_cache[0] == cache_key):
+            distance_field = self._distance_cache[1]
+        else:
+            # Step 1: Generate fault line traces
+            # WHY: Defines where mountains will form
+            fault_lines = self.generate_fault_lines(num_faults, terrain_type, seed)
+
+            if not fault_lines:
+                # WHY: Return flat terrain if no faults generated (edge case)
+                print("Warning: No fault lines generated, returning flat terrain")
+                return np.zeros((self.resolution, self.resolution), dtype=np.float32)
+
+            # Step 2: Create binary mask of fault locations
+            # WHY: Required input for distance transform
+            fault_mask = self.create_fault_mask(fault_lines)
+
+            if fast:
+                # WHY any(): a fault anywhere in a 2x2 block marks the coarse pixel
+                half = self.resolution // 2
+                fault_mask = fault_mask.reshape(half, 2, half, 2).any(axis=(1, 3))
+
+            # Step 3: Calculate distance field
+            # WHY: Needed for elevation falloff calculation
+            distance_field = self.calculate_distance_field(fault_mask)
+            if fast:
+                distance_field *= 2  # Coarse pixels are twice as wide
+            if cache_key is not None:
+                self._distance_cache = (cache_key, distance_field)
 
         # Step 4: Apply uplift profile
         # WHY: Converts distance to actual elevation values
         elevation = self.apply_uplift_profile(distance_field, max_uplift, falloff_meters)
 
-        return elevation.astype(np.float32)
+        if fast:
+            # WHY after exp: the uplift is smooth on the falloff scale (~170px)
+            # WHY opt-in: it changes the terrain a given seed produces
+            elevation = _upsample_2x(elevation)
+
+        # WHY copy=False: the distance field is float32, so this is usually a no-op
+        return elevation.astype(np.float32, copy=False)
 
     @staticmethod
     def generate_amplitude_modulated_terrain(
@@ -676,7 +798,11 @@ class TectonicStructureGenerator:
         # Step 2: Center noise around 0
         # WHY: Perlin returns [0, 1], but we need signed values for symmetric
         # modulation (both positive and negative variations from base elevation)
-        noise_centered = (base_noise - 0.5) * 2.0
+        # WHY float32 (and in place): the result is float32, so every pass
+        # over the grid from here on moves half the bytes
+        noise_centered = base_noise.astype(np.float32)
+        noise_centered -= 0.5
+        noise_centered *= 2.0
 
         if verbose:
             print(f"  Noise range (centered): [{noise_centered.min():.3f}, {noise_centered.max():.3f}]")
@@ -684,11 +810,10 @@ class TectonicStructureGenerator:
         # Step 3: Create amplitude modulation map
         # WHY: Binary mask defines where to apply different amplitudes
         # buildability_mask: 1 = buildable (low amplitude), 0 = scenic (high amplitude)
-        amplitude_map = np.where(
-            buildability_mask == 1,
-            buildable_amplitude,
-            scenic_amplitude
-        )
+        # WHY two-entry lookup table: same values as np.where, gathered faster
+        buildable_indices = buildability_mask == 1
+        amplitude_lut = np.array([scenic_amplitude, buildable_amplitude], dtype=np.float32)
+        amplitude_map = amplitude_lut[buildable_indices.view(np.uint8)]
 
         # Step 4: Apply amplitude modulation
         # WHY: Multiply noise by amplitude map to scale noise intensity
@@ -697,11 +822,19 @@ class TectonicStructureGenerator:
 
         # Calculate statistics for buildable and scenic zones
         # WHY: Verify amplitude modulation is working as expected
-        buildable_indices = buildability_mask == 1
-        scenic_indices = buildability_mask == 0
-
-        buildable_amplitude_mean = np.mean(np.abs(modulated_noise[buildable_indices]))
-        scenic_amplitude_mean = np.mean(np.abs(modulated_noise[scenic_indices]))
+        # WHY masked sums: boolean fancy indexing would gather a compacted copy
+        # of each zone before reducing. Each zone is reduced on its own in
+        # float64 (no total-minus-zone subtraction), so a small zone's mean
+        # does not lose precision. The mask is binary (validated above), so
+        # the scenic zone is the complement of the buildable one.
+        abs_noise = np.abs(modulated_noise)
+        buildable_count = int(np.count_nonzero(buildable_indices))
+        scenic_count = buildable_indices.size - buildable_count
+        buildable_sum = abs_noise.sum(where=buildable_indices, dtype=np.float64)
+        scenic_sum = abs_noise.sum(where=~buildable_indices, dtype=np.float64)
+
+        buildable_amplitude_mean = buildable_sum / buildable_count
+        scenic_amplitude_mean = scenic_sum / scenic_count
 
         if verbose:
             print(f"  Buildable zone amplitude (mean absolute): {buildable_amplitude_mean:.3f}")
@@ -727,12 +860,13 @@ class TectonicStructureGenerator:
         # If range is already close to [0, 1], just clip to avoid stretching
         if combined_min >= -0.1 and combined_max <= 1.1:
             # Already in good range, clip to [0, 1] without stretching
-            final_terrain = np.clip(combined, 0.0, 1.0)
+            final_terrain = np.clip(combined, 0.0, 1.0, out=combined)
             if verbose:
                 print(f"  [SMART NORM] Range acceptable, using clip (no gradient amplification)")
         elif combined_range > 0:
             # Range too large or shifted, normalize to [0, 1]
-            final_terrain = (combined - combined_min) / combined_range
+            final_terrain = np.subtract(combined, combined_min, out=combined)
+            final_terrain /= combined_range
             if verbose:
                 print(f"  [SMART NORM] Range requires normalization: [{combined_min:.3f}, {combined_max:.3f}]")
         else:
@@ -754,9 +888,9 @@ class TectonicStructureGenerator:
             'final_range': (float(final_terrain.min()), float(final_terrain.max())),
             'noise_octaves_used': noise_octaves,
             'single_frequency_field': True,  # Confirms no multi-octave blending
-            'buildable_pixels': int(np.sum(buildable_indices)),
-            'scenic_pixels': int(np.sum(scenic_indices)),
-            'buildable_percentage': float(100 * np.sum(buildable_indices) / buildable_indices.size),
+            'buildable_pixels': buildable_count,
+            'scenic_pixels': scenic_count,
+            'buildable_percentage': float(100 * buildable_count / buildable_indices.size),
         }
 
         if verbose:
@@ -764,4 +898,4 @@ class TectonicStructureGenerator:
             print(f"  Scenic pixels: {stats['scenic_pixels']:,}")
             print(f"  [Task 2.3 Complete]")
 
-        return final_terrain.astype(np.float32), stats
+        return final_terrain.astype(np.float32, copy=False), stats
@@ -0,0 +1,324 @@
+"""
+Unit tests for BuildabilityEnforcer slope analysis
+
+WHY THIS TEST FILE EXISTS:
+calculate_slopes() runs through a fused numba kernel when numba is available.
+These tests pin it to the straightforward np.gradient formula so the fast
+path cannot change which cells count as buildable.
+
+Created: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import buildability_enforcer as be
+from src.buildability_enforcer import BuildabilityEnforcer
+
+
+def _reference_slopes(heightmap, map_size_meters=14336.0):
+    """Unfused slope formula (np.gradient on heights in meters)."""
+    pixel_size_meters = map_size_meters / heightmap.shape[0]
+    dy, dx = np.gradient(heightmap * 4096.0)
+    return np.sqrt(dx**2 + dy**2) / pixel_size_meters * 100.0
+
+
+class TestCalculateSlopes:
+    """calculate_slopes() must match np.gradient bit for bit"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @pytest.mark.parametrize('shape', [(2, 2), (3, 7), (129, 100)])
+    def test_matches_reference(self, dtype, shape):
+        heightmap = np.random.default_rng(0).random(shape).astype(dtype)
+
+        slopes = BuildabilityEnforcer.calculate_slopes(heightmap, 3584.0)
+        expected = _reference_slopes(heightmap, 3584.0)
+
+        assert slopes.dtype == expected.dtype
+        np.testing.assert_array_equal(slopes, expected)
+
+    @pytest.mark.unit
+    def test_numpy_fallback_matches(self, monkeypatch):
+        heightmap = np.random.default_rng(1).random((64, 64))
+
+        fused = BuildabilityEnforcer.calculate_slopes(heightmap)
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', False)
+        fallback = BuildabilityEnforcer.calculate_slopes(heightmap)
+
+        np.testing.assert_array_equal(fused, fallback)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64, np.int32])
+    def test_tiled_fallback_matches_reference(self, dtype, monkeypatch):
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', False)
+        # Tiny blocks: many seams, and a last block of a single row
+        monkeypatch.setattr(be, '_SLOPE_TILE_BYTES', 1)
+        heightmap = (np.random.default_rng(15).random((41, 23)) * 8).astype(dtype)
+
+        slopes = BuildabilityEnforcer.calculate_slopes(heightmap, 3584.0)
+        expected = _reference_slopes(heightmap, 3584.0)
+
+        assert slopes.dtype == expected.dtype
+        np.testing.assert_array_equal(slopes, expected)
+
+    @pytest.mark.unit
+    def test_non_contiguous_input(self):
+        heightmap = np.random.default_rng(2).random((80, 80))[::2, ::2]
+
+        np.testing.assert_array_equal(
+            BuildabilityEnforcer.calculate_slopes(heightmap), _reference_slopes(heightmap))
+
+
+class TestSlopeCategoryCounts:
+    """Single-pass category counts must equal the comparison masks"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_numba', [True, False])
+    def test_matches_masks(self, use_numba, monkeypatch):
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', use_numba and be.NUMBA_AVAILABLE)
+        slopes = np.random.default_rng(3).random((97, 61)) * 20.0
+        slopes[0, :4] = [5.0, 10.0, np.nan, 0.0]
+
+        counts = be._slope_category_counts(slopes)
+
+        assert counts == (
+            np.sum(slopes <= 5.0),
+            np.sum((slopes > 5.0) & (slopes <= 10.0)),
+            np.sum(slopes > 10.0),
+        )
+
+
+class TestHeightmapBuildability:
+    """Fused percentage must equal thresholding the full slope map"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @pytest.mark.parametrize('use_numba', [True, False])
+    def test_matches_slope_map(self, dtype, use_numba, monkeypatch):
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', use_numba and be.NUMBA_AVAILABLE)
+        # Gentle terrain so a sizeable share of cells is buildable
+        heightmap = (np.random.default_rng(4).random((150, 120)) * 0.002).astype(dtype)
+
+        pct = BuildabilityEnforcer.calculate_heightmap_buildability(heightmap, 3584.0)
+        expected = BuildabilityEnforcer.calculate_buildability_percentage(
+            _reference_slopes(heightmap, 3584.0))
+
+        assert 0.0 < expected < 100.0
+        assert pct == expected
+
+
+class TestSmartBlurPrecision:
+    """smart_blur keeps the heightmap's float precision"""
+
+    @pytest.mark.unit
+    def test_float64_unchanged(self):
+        heightmap = np.random.default_rng(5).random((64, 64))
+        problem_mask = (np.random.default_rng(6).random((64, 64)) > 0.5).astype(np.float64)
+
+        result = BuildabilityEnforcer.smart_blur(heightmap, problem_mask, sigma=2.0)
+
+        variance = (be.gaussian_filter(heightmap**2, sigma=3)
+                    - be.gaussian_filter(heightmap, sigma=3)**2)
+        smooth_mask = problem_mask * (variance <= 0.05)
+        expected = (heightmap * (1.0 - smooth_mask)
+                    + be.gaussian_filter(heightmap, sigma=2.0) * smooth_mask)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+
+    @pytest.mark.unit
+    def test_float32_stays_float32(self):
+        heightmap = np.random.default_rng(7).random((64, 64)).astype(np.float32)
+        buildable_mask = np.ones((64, 64))
+
+        blurred = BuildabilityEnforcer.smart_blur(
+            heightmap, buildable_mask.astype(np.float32), sigma=2.0)
+        enforced, _ = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, buildable_mask, target_pct=100.0, tolerance=0.0,
+            max_iterations=1, sigma=2.0, verbose=False)
+
+        assert blurred.dtype == np.float32
+        assert enforced.dtype == np.float32
+
+
+class TestGaussianBlur:
+    """OpenCV / FFT blur must match gaussian_filter(mode='reflect')"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cv2', [True, False])
+    @pytest.mark.parametrize('sigma', [3.0, 8.0, 20.0])
+    @pytest.mark.parametrize('dtype, atol', [(np.float32, 1e-6), (np.float64, 1e-12)])
+    def test_matches_gaussian_filter(self, use_cv2, sigma, dtype, atol, monkeypatch):
+        if use_cv2 and not be.CV2_AVAILABLE:
+            pytest.skip("OpenCV not installed")
+        monkeypatch.setattr(be, 'CV2_AVAILABLE', use_cv2)
+        data = np.random.default_rng(8).random((181, 203)).astype(dtype)
+
+        blurred = be._gaussian_blur(data, sigma)
+
+        assert blurred.dtype == dtype
+        np.testing.assert_allclose(
+            blurred, be.gaussian_filter(data, sigma=sigma, mode='reflect'), rtol=0, atol=atol)
+
+
+class TestSlopeStatistics:
+    """Shared-partition statistics must equal numpy's exactly"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @pytest.mark.parametrize('shape', [(1, 1), (1, 10), (7, 5), (64, 64), (101, 99)])
+    def test_matches_numpy(self, dtype, shape):
+        slopes = (np.random.default_rng(9).random(shape) ** 3 * 30.0).astype(dtype)
+        slopes_with_ties = np.round(slopes)
+
+        for values in (slopes, slopes_with_ties):
+            stats = BuildabilityEnforcer.calculate_slope_statistics(values)
+            expected = {
+                'mean_slope': values.mean(),
+                'median_slope': np.median(values),
+                'p90_slope': np.percentile(values, 90),
+                'p99_slope': np.percentile(values, 99),
+            }
+
+            for key, value in expected.items():
+                assert stats[key] == value, key
+                assert np.asarray(stats[key]).dtype == np.asarray(value).dtype, key
+
+    @pytest.mark.unit
+    def test_input_not_modified(self):
+        slopes = np.random.default_rng(10).random((40, 40))
+        before = slopes.copy()
+
+        BuildabilityEnforcer.calculate_slope_statistics(slopes)
+
+        np.testing.assert_array_equal(slopes, before)
+
+
+class TestProblemCells:
+    """Fused problem-cell mask must equal thresholding the slope map"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @pytest.mark.parametrize('use_numba', [True, False])
+    def test_matches_slope_map(self, dtype, use_numba, monkeypatch):
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', use_numba and be.NUMBA_AVAILABLE)
+        heightmap = (np.random.default_rng(11).random((90, 110)) * 0.002).astype(dtype)
+        buildable_mask = (np.random.default_rng(12).random((90, 110)) > 0.5).astype(np.float64)
+
+        problem_mask, pct, count = be._problem_cells(heightmap, buildable_mask, 3584.0)
+
+        slopes = _reference_slopes(heightmap, 3584.0)
+        expected = (buildable_mask > 0.5) & (slopes > 5.0)
+        np.testing.assert_array_equal(problem_mask, expected)
+        assert pct == BuildabilityEnforcer.calculate_buildability_percentage(slopes)
+        assert count == np.count_nonzero(expected) > 0
+
+
+class TestSmartBlend:
+    """Fused smart_blur blend must equal the NumPy mask arithmetic"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    def test_matches_numpy_path(self, dtype, monkeypatch):
+        if not be.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        rng = np.random.default_rng(13)
+        # Mix of smooth and rough areas so both sides of the feature test occur
+        heightmap = (rng.random((96, 80)) * np.linspace(0.1, 1.5, 80)).astype(dtype)
+        problem_mask = (rng.random((96, 80)) > 0.3).astype(dtype)
+
+        fused = BuildabilityEnforcer.smart_blur(heightmap, problem_mask, sigma=2.0)
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', False)
+        fallback = BuildabilityEnforcer.smart_blur(heightmap, problem_mask, sigma=2.0)
+
+        assert fused.dtype == fallback.dtype == dtype
+        assert not np.array_equal(fused, heightmap)
+        np.testing.assert_array_equal(fused, fallback)
+
+
+class TestEnforceBuffers:
+    """enforce_buildability_constraint reuses its buffers without side effects"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_numba', [True, False])
+    def test_input_untouched_and_deterministic(self, use_numba, monkeypatch):
+        monkeypatch.setattr(be, 'NUMBA_AVAILABLE', use_numba and be.NUMBA_AVAILABLE)
+        heightmap = be.gaussian_filter(np.random.default_rng(14).random((128, 128)), 2) * 0.2
+        buildable_mask = np.ones_like(heightmap)
+        before = heightmap.copy()
+
+        first, stats = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, buildable_mask, target_pct=100.0, tolerance=0.0,
+            max_iterations=3, sigma=2.0, map_size_meters=3584.0, verbose=False)
+        second, _ = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, buildable_mask, target_pct=100.0, tolerance=0.0,
+            max_iterations=3, sigma=2.0, map_size_meters=3584.0, verbose=False)
+
+        assert stats['iterations'] == 3
+        np.testing.assert_array_equal(heightmap, before)
+        np.testing.assert_array_equal(first, second)
+        assert first is not heightmap
+
+    @pytest.mark.unit
+    def test_no_problem_cells_returns_copy(self):
+        heightmap = np.random.default_rng(17).random((64, 64))
+        scenic_only = np.zeros_like(heightmap)
+
+        result, stats = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, scenic_only, target_pct=100.0, tolerance=0.0, verbose=False)
+
+        assert stats['problem_cells'] == 0
+        assert result is not heightmap
+        np.testing.assert_array_equal(result, heightmap)
+
+
+class TestMedianAndPercentiles:
+    """One-partition median/percentiles must equal numpy's exactly"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int32])
+    @pytest.mark.parametrize('size', [1, 2, 9, 1000, 1001])
+    def test_matches_numpy(self, dtype, size):
+        values = (np.random.default_rng(size).random(size) * 50).astype(dtype)
+        percents = (75, 25, 50, 0, 100, 12.5)
+
+        median, results = be.median_and_percentiles(values, percents)
+
+        assert median == np.median(values)
+        assert np.asarray(median).dtype == np.median(values).dtype
+        for p, result in zip(percents, results):
+            expected = np.percentile(values, p)
+            assert result == expected, p
+            assert np.asarray(result).dtype == expected.dtype, p
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    def test_nan_propagates_like_numpy(self, dtype):
+        values = np.array([[np.nan, 1], [2, 3]], dtype=dtype)
+
+        median, results = be.median_and_percentiles(values, (90, 99))
+
+        assert np.isnan(median) and all(np.isnan(r) for r in results)
+        assert np.asarray(median).dtype == np.median(values).dtype
+
+
+class TestEnforceStall:
+    """Enforcement stops once an iteration stops improving buildability"""
+
+    @pytest.mark.unit
+    def test_stops_when_improvement_stalls(self):
+        heightmap = be.gaussian_filter(np.random.default_rng(16).random((128, 128)), 2) * 0.2
+        buildable_mask = np.ones_like(heightmap)
+        kwargs = dict(target_pct=100.0, tolerance=0.0, max_iterations=5, sigma=2.0,
+                      map_size_meters=3584.0, verbose=False)
+
+        _, full = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, buildable_mask, min_improvement=-np.inf, **kwargs)
+        _, stalled = BuildabilityEnforcer.enforce_buildability_constraint(
+            heightmap, buildable_mask, min_improvement=100.0, **kwargs)
+
+        assert full['iterations'] == 5
+        assert stalled['iterations'] == 1
@@ -10,7 +10,10 @@ Date: 2025-10-10
 import pytest
 import numpy as np
 import time
+from scipy.ndimage import gaussian_filter
 
+from src import buildability_enforcer as be
+from src.generation import constraint_verifier as cv
 from src.generation.constraint_verifier import ConstraintVerifier, verify_terrain_buildability
 from src.buildability_enforcer import BuildabilityEnforcer
 
@@ -421,6 +424,102 @@ class TestConvenienceFunction:
         assert 'final_buildable_pct' in result
 
 
+class TestBlendClipped:
+    """Fused masked blend must match np.clip(np.where(...))."""
+
+    @pytest.mark.parametrize('use_numba', [True, False])
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    def test_matches_where_clip(self, use_numba, dtype, monkeypatch):
+        if use_numba and not cv.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(cv, 'NUMBA_AVAILABLE', use_numba)
+        rng = np.random.default_rng(0)
+        original = (rng.random((97, 131)) * 1.4 - 0.2).astype(dtype)
+        smoothed = (rng.random((97, 131)) * 1.4 - 0.2).astype(dtype)
+        mask = rng.random((97, 131)) > 0.5
+
+        out = cv._blend_clipped(mask, smoothed, original, np.empty_like(original))
+
+        expected = np.clip(np.where(mask, smoothed, original), 0.0, 1.0)
+        assert out.dtype == expected.dtype
+        np.testing.assert_array_equal(out, expected)
+
+
+class TestBlurWindow:
+    """Blurring only the mask's window must match the full-map blur there."""
+
+    @pytest.mark.parametrize('use_cv2', [True, False])
+    @pytest.mark.parametrize('box', [(slice(40, 70), slice(90, 130)), (slice(0, 10), slice(150, 160))])
+    def test_tile_matches_full_blur(self, use_cv2, box, monkeypatch):
+        if use_cv2 and not be.CV2_AVAILABLE:
+            pytest.skip("OpenCV not installed")
+        monkeypatch.setattr(be, 'CV2_AVAILABLE', use_cv2)
+        data = np.random.default_rng(3).random((180, 160)).astype(np.float32)
+        mask = np.zeros(data.shape, dtype=bool)
+        mask[box] = np.random.default_rng(4).random(mask[box].shape) > 0.5
+
+        tile, inner = cv._blur_window(mask, 2.5)
+        blurred = cv._gaussian_blur(np.ascontiguousarray(data[tile]), 2.5)
+
+        full = cv._gaussian_blur(data, 2.5)
+        rows, cols = np.nonzero(mask)
+        bbox = (slice(rows.min(), rows.max() + 1), slice(cols.min(), cols.max() + 1))
+        # scipy is exact; OpenCV's SIMD passes may round the last bit differently
+        np.testing.assert_allclose(blurred[inner], full[bbox], rtol=0, atol=1e-6 if use_cv2 else 0)
+
+    def test_empty_mask_has_no_window(self):
+        assert cv._blur_window(np.zeros((64, 64), dtype=bool), 3.0) is None
+
+
+class TestChangeStats:
+    """Fused change statistics must match the NumPy reductions."""
+
+    @pytest.mark.parametrize('use_numba', [True, False])
+    @pytest.mark.parametrize('mask_fraction', [0.0, 0.3])
+    def test_matches_numpy(self, use_numba, mask_fraction, monkeypatch):
+        if use_numba and not cv.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(cv, 'NUMBA_AVAILABLE', use_numba)
+        rng = np.random.default_rng(2)
+        original = rng.random((120, 95)).astype(np.float32)
+        adjusted = rng.random((120, 95)).astype(np.float32)
+        mask = rng.random((120, 95)) < mask_fraction
+
+        mean_change, max_change, masked_change = cv._change_stats(original, adjusted, mask)
+
+        diff = np.abs(adjusted - original)
+        assert mean_change == pytest.approx(np.mean(diff), rel=1e-5)
+        assert max_change == pytest.approx(np.max(diff), rel=1e-6)
+        expected_masked = np.mean(diff[mask]) if mask.any() else 0.0
+        assert masked_change == pytest.approx(expected_masked, rel=1e-5)
+
+
+class TestGaussianBlur:
+    """OpenCV blur must match scipy's reflect-mode gaussian_filter."""
+
+    @pytest.mark.parametrize('use_cv2', [True, False])
+    @pytest.mark.parametrize('sigma', [1.5, 3.0, 8.0])
+    def test_matches_scipy(self, use_cv2, sigma, monkeypatch):
+        if use_cv2 and not be.CV2_AVAILABLE:
+            pytest.skip("OpenCV not installed")
+        monkeypatch.setattr(be, 'CV2_AVAILABLE', use_cv2)
+        data = np.random.default_rng(1).random((150, 211)).astype(np.float32)
+
+        blurred = cv._gaussian_blur(data, sigma)
+
+        expected = gaussian_filter(data, sigma=sigma, mode='reflect')
+        assert blurred.dtype == np.float32
+        np.testing.assert_allclose(blurred, expected, atol=1e-6)
+
+    @pytest.mark.parametrize('dtype', [np.uint8, np.int32])
+    def test_other_dtypes_use_scipy(self, dtype):
+        data = (np.random.default_rng(2).random((64, 80)) * 100).astype(dtype)
+
+        blurred = cv._gaussian_blur(data, 3.0)
+
+        np.testing.assert_array_equal(blurred, gaussian_filter(data, sigma=3.0, mode='reflect'))
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,176 @@
+"""
+Unit tests for NoiseGenerator buildability control maps
+
+WHY THIS TEST FILE EXISTS:
+generate_buildability_control_map() thresholds and morphologically smooths a
+noise field. The tests pin the result to the straightforward reference
+algorithm (percentile threshold + boolean closing with a disk) so that
+optimizations of the threshold/morphology stages cannot change the map.
+
+Created: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import noise_generator as ng
+from src.noise_generator import NoiseGenerator
+
+
+def _reference_control_map(noise, target_percent, smoothing_radius):
+    """Unoptimized control-map algorithm applied to raw noise values."""
+    control_map = (noise - noise.min()) / (noise.max() - noise.min())
+    threshold = np.percentile(control_map, 100 - target_percent)
+    binary = control_map >= threshold
+
+    if smoothing_radius > 0:
+        r = smoothing_radius
+        y, x = np.ogrid[-r:r + 1, -r:r + 1]
+        structure = x**2 + y**2 <= r**2
+        binary = ndimage.binary_dilation(binary, structure=structure)
+        binary = ndimage.binary_erosion(binary, structure=structure)
+
+    return binary.astype(np.float64)
+
+
+def _raw_control_noise(gen, resolution, seed):
+    noise = gen._configure_fastnoise(seed, ng.NoiseType.NoiseType_Perlin, 2, 0.5, 2.0, 0.001)
+    return gen._generate_noise_grid(noise, resolution)
+
+
+@pytest.mark.skipif(not ng.FASTNOISE_AVAILABLE, reason="requires pyfastnoiselite")
+class TestBuildabilityControlMap:
+    """Control map must match the reference threshold + closing"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('resolution, target, radius', [
+        (256, 50.0, 10),
+        (300, 35.0, 4),
+        (256, 70.0, 0),
+    ])
+    def test_matches_reference(self, resolution, target, radius):
+        gen = NoiseGenerator(seed=11)
+
+        result = gen.generate_buildability_control_map(
+            resolution, target_percent=target, seed=5, smoothing_radius=radius)
+        expected = _reference_control_map(
+            _raw_control_noise(gen, resolution, 5), target, radius)
+
+        assert result.dtype == np.float64
+        np.testing.assert_array_equal(result, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cv2, radius', [
+        (True, 3),     # OpenCV
+        (True, 10),    # run-length (above the OpenCV radius cutoff)
+        (False, 1),
+        (False, 6),
+        (False, 15),
+    ])
+    def test_closing_backends_match_reference(self, use_cv2, radius, monkeypatch):
+        if use_cv2 and not ng.CV2_AVAILABLE:
+            pytest.skip("OpenCV not installed")
+        monkeypatch.setattr(ng, 'CV2_AVAILABLE', use_cv2)
+        mask = np.random.default_rng(3).random((200, 170)) > 0.7
+
+        closed = ng._close_with_disk(mask, radius)
+
+        structure = ng._circular_structure(radius)
+        expected = ndimage.binary_erosion(
+            ndimage.binary_dilation(mask, structure=structure), structure=structure)
+        assert closed.dtype == bool
+        np.testing.assert_array_equal(closed, expected)
+
+
+@pytest.mark.skipif(not ng.FASTNOISE_AVAILABLE, reason="requires pyfastnoiselite")
+class TestPerlinCache:
+    """Repeated generate_perlin() calls reuse the last field when enabled"""
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self):
+        gen = NoiseGenerator(seed=21)
+        gen.generate_perlin(128, octaves=4, show_progress=False)
+
+        assert gen._perlin_cache is None
+
+    @pytest.mark.unit
+    def test_hit_returns_independent_copy(self):
+        gen = NoiseGenerator(seed=21, cache_perlin=True)
+        first = gen.generate_perlin(128, octaves=4, show_progress=False)
+        expected = first.copy()
+        first[:] = 0.0  # Caller modifications must not leak into the cache
+
+        second = gen.generate_perlin(128, octaves=4, show_progress=False)
+
+        np.testing.assert_array_equal(second, expected)
+        np.testing.assert_array_equal(
+            second, NoiseGenerator(seed=21).generate_perlin(128, octaves=4, show_progress=False))
+
+    @pytest.mark.unit
+    def test_parameter_or_seed_change_regenerates(self):
+        gen = NoiseGenerator(seed=21, cache_perlin=True)
+        base = gen.generate_perlin(128, octaves=4, show_progress=False)
+
+        assert not np.array_equal(base, gen.generate_perlin(128, octaves=3, show_progress=False))
+        gen.seed = 22
+        np.testing.assert_array_equal(
+            gen.generate_perlin(128, octaves=4, show_progress=False),
+            NoiseGenerator(seed=22).generate_perlin(128, octaves=4, show_progress=False))
+
+
+class TestRunLengthMorphology:
+    """Row-run disk decomposition must equal scipy's binary morphology"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('radius', [1, 2, 5, 12])
+    def test_dilation_and_erosion_match_ndimage(self, radius):
+        mask = np.random.default_rng(radius).random((131, 157)) > 0.6
+        structure = ng._circular_structure(radius)
+
+        np.testing.assert_array_equal(
+            ng._runlength_binary_dilation(mask, structure),
+            ndimage.binary_dilation(mask, structure=structure))
+        np.testing.assert_array_equal(
+            ng._runlength_binary_erosion(mask, structure),
+            ndimage.binary_erosion(mask, structure=structure))
+
+
+class TestCircularStructure:
+    """Disk structuring element is cached and immutable"""
+
+    @pytest.mark.unit
+    def test_disk_shape_and_cache(self):
+        structure = ng._circular_structure(3)
+
+        assert structure.shape == (7, 7)
+        assert structure[3, 0] and structure[3, 6] and not structure[0, 0]
+        assert ng._circular_structure(3) is structure
+        assert not structure.flags.writeable
+
+
+class TestPercentileThreshold:
+    """Single-partition percentile must equal np.percentile exactly"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @pytest.mark.parametrize('percent', [0.0, 12.345, 30.0, 50.0, 62.5, 100.0])
+    def test_matches_numpy(self, dtype, percent):
+        values = np.random.default_rng(4).random((301, 257)).astype(dtype)
+
+        result = ng._percentile_threshold(values, percent)
+        expected = np.percentile(values, percent)
+
+        assert result == expected
+        assert np.asarray(result).dtype == np.asarray(expected).dtype
+
+    @pytest.mark.unit
+    def test_ties(self):
+        values = np.round(np.random.default_rng(5).random(10_000) * 8) / 8
+
+        for percent in (25.0, 50.0, 73.1):
+            assert ng._percentile_threshold(values, percent) == np.percentile(values, percent)
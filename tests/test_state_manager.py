@@ -0,0 +1,208 @@
+"""
+Unit tests for the undo/redo Command pattern (state_manager.py)
+
+WHY THIS TEST FILE EXISTS:
+Commands store only as much undo state as they need (a bounding-box patch,
+an affine range, ...) instead of full heightmap snapshots. These tests make
+sure every command still restores the exact pre-execute heightmap.
+
+Created: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.heightmap_generator import HeightmapGenerator
+from src.state_manager import (
+    AddCircleCommand,
+    CommandHistory,
+    MacroCommand,
+    NormalizeCommand,
+    SmoothCommand,
+)
+
+
+@pytest.fixture
+def generator():
+    gen = HeightmapGenerator(resolution=256)
+    gen.set_height_data(np.random.default_rng(7).random((256, 256)))
+    return gen
+
+
+class TestAddCircleCommand:
+    """AddCircleCommand stores only the circle's bounding box"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('center', [(0.5, 0.5), (0.02, 0.97), (1.2, -0.1)])
+    def test_undo_restores_exactly(self, generator, center):
+        before = generator.get_height_data()
+        command = AddCircleCommand(generator, center[0], center[1], radius=0.1, height=0.4)
+
+        command.execute()
+        command.undo()
+
+        np.testing.assert_array_equal(generator.heightmap, before)
+
+    @pytest.mark.unit
+    def test_stores_patch_not_full_snapshot(self, generator):
+        command = AddCircleCommand(generator, 0.5, 0.5, radius=0.05, height=0.3)
+        command.execute()
+
+        assert command.old_data is None
+        r = int(0.05 * 256)
+        assert command.old_patch.shape == (2 * r + 1, 2 * r + 1)
+
+    @pytest.mark.unit
+    def test_out_of_range_map_uses_full_snapshot(self, generator):
+        # add_circle() clips the whole map, so values outside [0, 1]
+        # elsewhere on the map must still be restored by undo
+        generator.heightmap[0, 0] = 1.5
+        before = generator.get_height_data()
+        command = AddCircleCommand(generator, 0.5, 0.5, radius=0.05, height=0.3)
+
+        command.execute()
+        assert command.old_patch is None
+        command.undo()
+
+        np.testing.assert_array_equal(generator.heightmap, before)
+
+
+class TestNormalizeCommand:
+    """NormalizeCommand inverts the affine map from the stored range"""
+
+    @pytest.mark.unit
+    def test_undo_restores_range(self, generator):
+        generator.heightmap = generator.heightmap * 0.5 + 0.2
+        before = generator.get_height_data()
+        command = NormalizeCommand(generator, 0.1, 0.9)
+
+        command.execute()
+        assert command.old_data is None
+        command.undo()
+
+        np.testing.assert_allclose(generator.heightmap, before, atol=1e-12)
+
+    @pytest.mark.unit
+    def test_flat_map_round_trip(self, generator):
+        generator.create_flat(0.3)
+        command = NormalizeCommand(generator, 0.0, 1.0)
+
+        command.execute()
+        command.undo()
+
+        np.testing.assert_array_equal(generator.heightmap, 0.3)
+
+    @pytest.mark.unit
+    def test_empty_target_range_uses_full_snapshot(self, generator):
+        before = generator.get_height_data()
+        command = NormalizeCommand(generator, 0.5, 0.5)
+
+        command.execute()
+        assert command.old_data is not None
+        command.undo()
+
+        np.testing.assert_array_equal(generator.heightmap, before)
+
+
+class TestMacroCommand:
+    """MacroCommand snapshots once instead of once per sub-command"""
+
+    @pytest.mark.unit
+    def test_single_snapshot_round_trip(self, generator):
+        before = generator.get_height_data()
+        macro = MacroCommand([
+            SmoothCommand(generator),
+            AddCircleCommand(generator, 0.5, 0.5, radius=0.1, height=0.3),
+            NormalizeCommand(generator, 0.1, 0.9),
+        ], "Macro")
+
+        macro.execute()
+        after = generator.get_height_data()
+        assert macro.old_data is not None
+        assert all(getattr(cmd, 'old_data', None) is None for cmd in macro.commands)
+        assert macro.commands[1].old_patch is None
+
+        macro.undo()
+        np.testing.assert_array_equal(generator.heightmap, before)
+
+        macro.execute()
+        np.testing.assert_array_equal(generator.heightmap, after)
+
+    @pytest.mark.unit
+    def test_mixed_generators_fall_back_to_children(self, generator):
+        other = HeightmapGenerator(resolution=256)
+        other.create_flat(0.5)
+        before, other_before = generator.get_height_data(), other.get_height_data()
+        macro = MacroCommand([SmoothCommand(generator), NormalizeCommand(other, 0.2, 0.4)], "Macro")
+
+        macro.execute()
+        assert macro.old_data is None
+        macro.undo()
+
+        np.testing.assert_array_equal(generator.heightmap, before)
+        np.testing.assert_array_equal(other.heightmap, other_before)
+
+
+class TestCommandHistory:
+    """History bookkeeping across command types"""
+
+    @pytest.mark.unit
+    def test_memory_usage_counts_patches(self, generator):
+        history = CommandHistory()
+        history.execute(AddCircleCommand(generator, 0.5, 0.5, radius=0.05, height=0.3))
+        history.execute(SmoothCommand(generator))
+
+        usage = history.get_memory_usage()
+        expected = (generator.heightmap.nbytes + history.undo_stack[0].old_patch.nbytes)
+
+        assert usage['undo_memory_mb'] == pytest.approx(expected / (1024 * 1024))
+
+    @pytest.mark.unit
+    def test_undo_redo_sequence(self, generator):
+        original = generator.get_height_data()
+        history = CommandHistory()
+
+        history.execute(AddCircleCommand(generator, 0.3, 0.3, radius=0.1, height=0.2))
+        after_circle = generator.get_height_data()
+        history.execute(NormalizeCommand(generator, 0.2, 0.8))
+
+        history.undo()
+        np.testing.assert_allclose(generator.heightmap, after_circle, atol=1e-12)
+        history.undo()
+        np.testing.assert_allclose(generator.heightmap, original, atol=1e-12)
+
+        history.redo()
+        np.testing.assert_allclose(generator.heightmap, after_circle, atol=1e-12)
+
+    @pytest.mark.unit
+    def test_history_evicts_oldest(self, generator):
+        history = CommandHistory(max_history=3)
+        commands = [SmoothCommand(generator) for _ in range(5)]
+        for command in commands:
+            history.execute(command)
+
+        assert list(history.undo_stack) == commands[-3:]
+        assert history.get_undo_list() == [cmd.description for cmd in reversed(commands[-3:])]
+
+    @pytest.mark.unit
+    def test_evicted_snapshot_is_reused(self, generator):
+        history = CommandHistory(max_history=2)
+        first = SmoothCommand(generator)
+        history.execute(first)
+        buffer = first.old_data
+        history.execute(SmoothCommand(generator))
+
+        # Third command evicts the first; its snapshot buffer is recycled
+        history.execute(SmoothCommand(generator))
+        assert first.old_data is None
+        before_fourth = generator.get_height_data()
+        fourth = SmoothCommand(generator)
+        history.execute(fourth)
+
+        assert fourth.old_data is buffer
+        history.undo()
+        np.testing.assert_array_equal(generator.heightmap, before_fourth)
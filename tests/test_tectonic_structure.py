@@ -31,6 +31,7 @@ from scipy.ndimage import gaussian_filter
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import tectonic_generator as tg
 from tectonic_generator import TectonicStructureGenerator
 
 
@@ -305,6 +306,119 @@ class TestTectonicStructureGenerator:
         assert not np.allclose(terrain1, terrain2), "Different seeds produced identical results"
 
 
+class TestUpliftProfile:
+    """Uplift stays in [0, 1] whether or not the clip can be skipped"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('max_uplift, offset, falloff', [
+        (0.8, 0.0, 600.0),      # in range: clip skipped
+        (1.5, 0.0, 600.0),      # above 1 at the fault
+        (0.8, -900.0, 600.0),   # negative distances
+        (-0.2, 0.0, 600.0),     # negative uplift
+        (0.8, 0.0, -600.0),     # negative falloff grows with distance
+    ])
+    def test_matches_clipped_formula(self, max_uplift, offset, falloff):
+        generator = TectonicStructureGenerator(resolution=64)
+        distance = np.random.default_rng(2).random((64, 64)).astype(np.float32) * 3000 + offset
+
+        elevation = generator.apply_uplift_profile(distance, max_uplift, falloff)
+
+        expected = np.clip(max_uplift * np.exp(-distance / falloff), 0.0, 1.0)
+        np.testing.assert_array_equal(elevation, expected)
+
+
+class TestDistanceFieldCache:
+    """Re-running with new uplift parameters reuses the distance field"""
+
+    @pytest.mark.unit
+    def test_uplift_sweep_skips_distance_transform(self, monkeypatch):
+        generator = TectonicStructureGenerator(resolution=256)
+        calls = []
+        original = generator.calculate_distance_field
+        monkeypatch.setattr(generator, 'calculate_distance_field',
+                            lambda mask: calls.append(1) or original(mask))
+
+        generator.generate_tectonic_terrain(num_faults=3, seed=4)
+        swept = generator.generate_tectonic_terrain(
+            num_faults=3, max_uplift=0.5, falloff_meters=1200.0, seed=4)
+
+        fresh = TectonicStructureGenerator(resolution=256).generate_tectonic_terrain(
+            num_faults=3, max_uplift=0.5, falloff_meters=1200.0, seed=4)
+        assert len(calls) == 1
+        np.testing.assert_array_equal(swept, fresh)
+
+    @pytest.mark.unit
+    def test_new_faults_recompute(self):
+        generator = TectonicStructureGenerator(resolution=256)
+
+        generator.generate_tectonic_terrain(num_faults=3, seed=4)
+        other = generator.generate_tectonic_terrain(num_faults=3, seed=5)
+
+        fresh = TectonicStructureGenerator(resolution=256).generate_tectonic_terrain(
+            num_faults=3, seed=5)
+        np.testing.assert_array_equal(other, fresh)
+
+    @pytest.mark.unit
+    def test_unseeded_calls_bypass_cache(self):
+        generator = TectonicStructureGenerator(resolution=256)
+
+        first = generator.generate_tectonic_terrain(num_faults=3, seed=None)
+        second = generator.generate_tectonic_terrain(num_faults=3, seed=None)
+
+        assert generator._distance_cache is None
+        assert not np.array_equal(first, second)
+
+
+class TestFastTectonicTerrain:
+    """Half-resolution uplift stays close to the full-resolution result"""
+
+    @pytest.mark.unit
+    def test_close_to_full_resolution(self):
+        generator = TectonicStructureGenerator(resolution=1024)
+
+        exact = generator.generate_tectonic_terrain(num_faults=4, seed=8)
+        fast = generator.generate_tectonic_terrain(num_faults=4, seed=8, fast=True)
+
+        assert fast.shape == exact.shape and fast.dtype == np.float32
+        assert np.abs(fast - exact).max() < 0.03
+        assert np.abs(fast - exact).mean() < 0.005
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_cv2', [True, False])
+    def test_upsample_backends_agree(self, use_cv2, monkeypatch):
+        if use_cv2 and not tg.CV2_AVAILABLE:
+            pytest.skip("OpenCV not installed")
+        monkeypatch.setattr(tg, 'CV2_AVAILABLE', use_cv2)
+        data = np.random.default_rng(6).random((40, 30)).astype(np.float32)
+
+        up = tg._upsample_2x(data)
+
+        # Even fine pixels sit a quarter coarse pixel before coarse centers
+        assert up.shape == (80, 60)
+        np.testing.assert_allclose(up[2:-2:2, 2:-2:2], (
+            0.75 * (0.75 * data[1:-1, 1:-1] + 0.25 * data[:-2, 1:-1]) +
+            0.25 * (0.75 * data[1:-1, :-2] + 0.25 * data[:-2, :-2])), rtol=1e-5)
+
+
+class TestDistanceFieldBackends:
+    """Optional fast EDT must match the scipy distance field"""
+
+    @pytest.mark.unit
+    def test_edt_matches_scipy(self, monkeypatch):
+        if not tg.EDT_AVAILABLE:
+            pytest.skip("edt not installed")
+        generator = TectonicStructureGenerator(resolution=512)
+        fault_mask = generator.create_fault_mask(
+            generator.generate_fault_lines(num_faults=3, terrain_type='mixed', seed=9))
+
+        fast = generator.calculate_distance_field(fault_mask)
+        monkeypatch.setattr(tg, 'EDT_AVAILABLE', False)
+        reference = generator.calculate_distance_field(fault_mask)
+
+        assert np.all(fast[fault_mask] == 0)
+        np.testing.assert_allclose(fast, reference, rtol=1e-6, atol=1e-3)
+
+
 class TestTectonicQualityMetrics:
     """Quality and geological realism measurements"""
 